@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Persistent scan cache for Multi-Agent Workforce
+Stores per-file scan results keyed by path, mtime and size across agent runs
+"""
+
+import os
+import sqlite3
+from typing import Optional
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', '.agents_cache')
+
+class JSDocCache:
+    """SQLite-backed cache of has_jsdoc_comments results"""
+
+    def __init__(self, db_path: str = os.path.join(CACHE_DIR, 'jsdoc.db')):
+        self.db_path = db_path
+        self.conn = None
+        self.disabled = False
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the cache database on first use"""
+        if self.conn is None and not self.disabled:
+            try:
+                os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+                self.conn = sqlite3.connect(self.db_path)
+                self.conn.execute("PRAGMA journal_mode=WAL")
+                self.conn.execute("PRAGMA synchronous=NORMAL")
+                self.conn.execute(
+                    "CREATE TABLE IF NOT EXISTS jsdoc ("
+                    "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, has_jsdoc INTEGER)"
+                )
+            except sqlite3.Error:
+                # A read-only or broken cache must never fail the scan
+                self.conn = None
+                self.disabled = True
+        return self.conn
+
+    def get(self, path: str, mtime_ns: int, size: int) -> Optional[bool]:
+        """Return the cached result, or None if missing or stale"""
+        conn = self._connect()
+        if conn is None:
+            return None
+
+        try:
+            row = conn.execute(
+                "SELECT has_jsdoc FROM jsdoc WHERE path = ? AND mtime_ns = ? AND size = ?",
+                (path, mtime_ns, size)
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        return None if row is None else bool(row[0])
+
+    def set(self, path: str, mtime_ns: int, size: int, has_jsdoc: bool):
+        """Store a result; written to disk on the next commit()"""
+        conn = self._connect()
+        if conn is None:
+            return
+
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO jsdoc (path, mtime_ns, size, has_jsdoc) VALUES (?, ?, ?, ?)",
+                (path, mtime_ns, size, int(has_jsdoc))
+            )
+        except sqlite3.Error:
+            pass
+
+    def commit(self):
+        """Flush pending results in a single transaction"""
+        if self.conn is not None:
+            try:
+                self.conn.commit()
+            except sqlite3.Error:
+                pass
+
+# Global cache instance
+jsdoc_cache = JSDocCache()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Queued logging setup for Multi-Agent Workforce
+Hands log records to a listener thread so agent threads never block on handler I/O
+"""
+
+import queue
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional, Union
+
+def setup_queue_logging(fmt: str, level: Union[int, str] = logging.INFO,
+                        log_file: Optional[str] = None) -> Optional[QueueListener]:
+    """Route root logger records to the console (and log_file) via a queue listener"""
+    root_logger = logging.getLogger()
+    
+    # Like logging.basicConfig, leave an already configured root logger alone
+    if root_logger.handlers:
+        return None
+    
+    formatter = logging.Formatter(fmt)
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.insert(0, RotatingFileHandler(log_file, maxBytes=50_000_000, backupCount=5))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    log_listener.start()
+    # Drain queued records on interpreter exit
+    atexit.register(log_listener.stop)
+    
+    root_logger.setLevel(level)
+    root_logger.addHandler(QueueHandler(log_queue))
+    return log_listener
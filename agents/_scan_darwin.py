@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+macOS directory scanning for Multi-Agent Workforce
+Reads a whole directory's names, types, mtimes and sizes per getattrlistbulk(2) call
+"""
+
+import os
+import sys
+import errno
+import ctypes
+import ctypes.util
+import struct
+from typing import Iterator, Tuple
+
+# <sys/attr.h>
+ATTR_BIT_MAP_COUNT = 5
+ATTR_CMN_NAME = 0x00000001
+ATTR_CMN_OBJTYPE = 0x00000008
+ATTR_CMN_MODTIME = 0x00000400
+ATTR_CMN_ERROR = 0x20000000
+ATTR_CMN_RETURNED_ATTRS = 0x80000000
+REQUESTED_ATTRS = (ATTR_CMN_RETURNED_ATTRS | ATTR_CMN_ERROR | ATTR_CMN_NAME |
+                   ATTR_CMN_OBJTYPE | ATTR_CMN_MODTIME)
+ATTR_FILE_DATALENGTH = 0x00000200
+REQUESTED_FILE_ATTRS = ATTR_FILE_DATALENGTH
+
+# <sys/vnode.h>
+VDIR = 2
+
+BUFFER_SIZE = 256 * 1024
+
+_ENTRY_HEADER = struct.Struct('=I5I')  # length, attribute_set_t returned
+_UINT32 = struct.Struct('=I')
+_ATTRREFERENCE = struct.Struct('=iI')  # attr_dataoffset, attr_length
+_TIMESPEC = struct.Struct('=qq')
+_OFF_T = struct.Struct('=q')
+
+class BulkReadUnsupported(OSError):
+    """getattrlistbulk is unavailable here, or the filesystem does not support it"""
+
+class AttrList(ctypes.Structure):
+    _fields_ = [
+        ("bitmapcount", ctypes.c_ushort),
+        ("reserved", ctypes.c_uint16),
+        ("commonattr", ctypes.c_uint32),
+        ("volattr", ctypes.c_uint32),
+        ("dirattr", ctypes.c_uint32),
+        ("fileattr", ctypes.c_uint32),
+        ("forkattr", ctypes.c_uint32),
+    ]
+
+def _load_getattrlistbulk():
+    """Resolve getattrlistbulk from libc, or None when not on macOS"""
+    if sys.platform != 'darwin':
+        return None
+
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        func = libc.getattrlistbulk
+    except (OSError, AttributeError):
+        return None
+
+    func.argtypes = [ctypes.c_int, ctypes.POINTER(AttrList), ctypes.c_void_p,
+                     ctypes.c_size_t, ctypes.c_uint64]
+    func.restype = ctypes.c_int
+    return func
+
+_getattrlistbulk = _load_getattrlistbulk()
+AVAILABLE = _getattrlistbulk is not None
+
+def _parse_entries(view: memoryview, count: int) -> Iterator[Tuple[str, bool, int, int]]:
+    """Decode `count` packed entries from a getattrlistbulk buffer"""
+    offset = 0
+    for _ in range(count):
+        header = _ENTRY_HEADER.unpack_from(view, offset)
+        entry_length, commonattr, fileattr = header[0], header[1], header[4]
+        field = offset + _ENTRY_HEADER.size
+        offset += entry_length
+
+        if commonattr & ATTR_CMN_ERROR:
+            (error,) = _UINT32.unpack_from(view, field)
+            field += _UINT32.size
+            if error:
+                continue
+
+        if not commonattr & ATTR_CMN_NAME:
+            continue
+        name_offset, name_length = _ATTRREFERENCE.unpack_from(view, field)
+        name_start = field + name_offset
+        # attr_length includes the trailing NUL
+        name = os.fsdecode(bytes(view[name_start:name_start + name_length - 1]))
+        field += _ATTRREFERENCE.size
+
+        is_dir = False
+        if commonattr & ATTR_CMN_OBJTYPE:
+            (obj_type,) = _UINT32.unpack_from(view, field)
+            is_dir = obj_type == VDIR
+            field += _UINT32.size
+
+        mtime_ns = 0
+        if commonattr & ATTR_CMN_MODTIME:
+            seconds, nanoseconds = _TIMESPEC.unpack_from(view, field)
+            mtime_ns = seconds * 1_000_000_000 + nanoseconds
+            field += _TIMESPEC.size
+
+        # File attributes follow the common ones; directories do not return them
+        size = 0
+        if fileattr & ATTR_FILE_DATALENGTH:
+            (size,) = _OFF_T.unpack_from(view, field)
+
+        yield name, is_dir, mtime_ns, size
+
+def scan_dir(path: str) -> Iterator[Tuple[str, bool, int, int]]:
+    """Yield (name, is_dir, mtime_ns, size) per entry; raises BulkReadUnsupported before any yield"""
+    if not AVAILABLE:
+        raise BulkReadUnsupported(errno.ENOTSUP, "getattrlistbulk is not available", path)
+
+    attrlist = AttrList(bitmapcount=ATTR_BIT_MAP_COUNT, commonattr=REQUESTED_ATTRS,
+                        fileattr=REQUESTED_FILE_ATTRS)
+    buf = ctypes.create_string_buffer(BUFFER_SIZE)
+    view = memoryview(buf).cast('B')
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        first_batch = True
+        while True:
+            count = _getattrlistbulk(fd, ctypes.byref(attrlist), buf, BUFFER_SIZE, 0)
+            if count < 0:
+                err = ctypes.get_errno()
+                # Some filesystems (e.g. network mounts) do not support bulk reads
+                if first_batch and err in (errno.ENOTSUP, errno.EINVAL):
+                    raise BulkReadUnsupported(err, os.strerror(err), path)
+                raise OSError(err, os.strerror(err), path)
+            if count == 0:
+                return
+
+            first_batch = False
+            yield from _parse_entries(view, count)
+    finally:
+        os.close(fd)
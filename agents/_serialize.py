@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+JSON serialization for Multi-Agent Workforce
+Uses orjson when it is installed and falls back to the stdlib json module
+"""
+
+from dataclasses import asdict
+from typing import Any
+
+try:
+    import orjson
+
+    def dumps_indented(obj: Any) -> str:
+        """Serialize agent output as indented JSON using orjson"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Serialize to compact JSON bytes using orjson, which encodes dataclasses natively"""
+        return orjson.dumps(obj)
+
+    def loads(data: bytes) -> Any:
+        """Parse JSON using orjson"""
+        return orjson.loads(data)
+except ImportError:
+    import json
+
+    def dumps_indented(obj: Any) -> str:
+        """Serialize agent output as indented JSON using the stdlib"""
+        return json.dumps(obj, indent=2)
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Serialize to compact JSON bytes using the stdlib"""
+        return json.dumps(obj, default=asdict).encode()
+
+    def loads(data: bytes) -> Any:
+        """Parse JSON using the stdlib"""
+        return json.loads(data)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Task registry for Multi-Agent Workforce
+Parses agents/tasks.yaml once per file version and indexes tasks by id
+"""
+
+import os
+from functools import lru_cache
+from typing import Dict, Any, Tuple
+
+TASKS_PATH = os.path.join(os.path.dirname(__file__), 'tasks.yaml')
+
+@lru_cache(maxsize=1)
+def _parse_tasks(tasks_path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a tasks file; memoized on its path and modification time"""
+    import yaml
+    try:
+        # Prefer the libyaml C parser; fall back to pure Python if unavailable
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml import SafeLoader
+
+    with open(tasks_path, 'r') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+def load_tasks() -> Dict[str, Any]:
+    """Load tasks from agents/tasks.yaml, reparsing only after it changes"""
+    return _parse_tasks(TASKS_PATH, os.stat(TASKS_PATH).st_mtime_ns)
+
+def load_task_index() -> Dict[str, Tuple[str, Dict[str, Any]]]:
+    """Load tasks.yaml and index every task item as id -> (category, item)"""
+    return _index_tasks(TASKS_PATH, os.stat(TASKS_PATH).st_mtime_ns)
+
+@lru_cache(maxsize=1)
+def _index_tasks(tasks_path: str, mtime_ns: int) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+    """Build the id index for one version of the tasks file"""
+    index = {}
+    for category, items in _parse_tasks(tasks_path, mtime_ns).items():
+        if isinstance(items, list):
+            for item in items:
+                if isinstance(item, dict) and 'id' in item:
+                    # First definition of an id wins
+                    index.setdefault(item['id'], (category, item))
+    return index
+
+def get_task(task_id: str) -> Dict[str, Any]:
+    """Look up task details by id"""
+    try:
+        index = load_task_index()
+    except Exception as e:
+        return {"id": task_id, "title": "Error loading task", "error": str(e)}
+
+    entry = index.get(task_id)
+    if entry is None:
+        return {"id": task_id, "title": "Unknown task", "category": "unknown"}
+    return entry[1]
@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Timestamp formatting for Multi-Agent Workforce
+Second-precision ISO 8601 strings, formatted once per second
+"""
+
+import time
+from datetime import datetime
+from functools import lru_cache
+
+def now_iso() -> str:
+    """Current local time as an ISO 8601 string, to the second"""
+    return format_timestamp(int(time.time()))
+
+@lru_cache(maxsize=1)
+def format_timestamp(seconds: int) -> str:
+    """Format a whole-second timestamp; every call within the same second reuses the string"""
+    return datetime.fromtimestamp(seconds).isoformat()
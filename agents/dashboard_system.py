@@ -79,7 +79,7 @@ class AgentDashboardHandler(BaseHTTPRequestHandler):
         """Serve metrics data"""
         try:
             metrics_data = {
-                "metrics": [asdict(metric) for metric in observability_dashboard.metrics_collector.metrics],
+                "metrics": [asdict(metric) for metric in observability_dashboard.metrics_collector.snapshot()],
                 "summaries": {
                     name: observability_dashboard.metrics_collector.get_metric_summary(name)
                     for name in ["task_duration", "success_rate", "error_count"]
@@ -96,7 +96,7 @@ class AgentDashboardHandler(BaseHTTPRequestHandler):
         """Serve logs data"""
         try:
             logs_data = {
-                "logs": [asdict(log) for log in observability_dashboard.log_collector.logs],
+                "logs": [asdict(log) for log in observability_dashboard.log_collector.snapshot()],
                 "recent_logs": [asdict(log) for log in observability_dashboard.log_collector.get_recent_logs(50)]
             }
             self.send_response(200)
@@ -493,7 +493,7 @@ class ReportGenerator:
         """Generate task-specific summary report"""
         # Get metrics for specific task
         task_metrics = observability_dashboard.metrics_collector.get_metrics_by_task(task_id)
-        task_logs = [log for log in observability_dashboard.log_collector.logs if log.task_id == task_id]
+        task_logs = [log for log in observability_dashboard.log_collector.snapshot() if log.task_id == task_id]
         
         return {
             "report_type": "task_summary",
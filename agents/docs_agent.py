@@ -6,75 +6,140 @@ Handles documentation generation, updates, and maintenance
 
 import os
 import sys
-import json
-import subprocess
-from datetime import datetime
-from typing import Dict, List, Any
+import functools
+from collections import Counter
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 import re
 
 # Add mcp_servers to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'mcp_servers'))
 
-def load_task_details(task_id: str) -> Dict[str, Any]:
-    """Load task details from tasks.yaml"""
-    tasks_path = os.path.join(os.path.dirname(__file__), '..', 'agents', 'tasks.yaml')
-    
+import _scan_darwin
+from _cache import jsdoc_cache
+from _tasks import get_task
+from _serialize import dumps_indented
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+REPO_ROOT_PREFIX = REPO_ROOT + os.sep
+SKIP_DIRS = {'node_modules', '.git', 'coverage', 'dist', 'build'}
+SOURCE_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx')
+API_DOCS_LIMIT = 5
+
+def _list_dir_scandir(path: str) -> Iterator[Tuple[str, bool, Optional[int], Optional[int]]]:
+    """Yield (name, is_dir, None, None) for each entry via os.scandir; files are stat'ed later, if needed"""
+    with os.scandir(path) as entries:
+        for entry in entries:
+            yield entry.name, entry.is_dir(follow_symlinks=False), None, None
+
+def _list_dir_darwin(path: str) -> Iterator[Tuple[str, bool, Optional[int], Optional[int]]]:
+    """Yield (name, is_dir, mtime_ns, size) for each entry using batched getattrlistbulk reads"""
     try:
-        import yaml
-        with open(tasks_path, 'r') as f:
-            tasks = yaml.safe_load(f)
-        
-        # Find the specific task
-        for category, items in tasks.items():
-            if isinstance(items, list):
-                for item in items:
-                    if isinstance(item, dict) and item.get('id') == task_id:
-                        return item
-        
-        return {"id": task_id, "title": "Unknown task", "category": "unknown"}
-    except Exception as e:
-        return {"id": task_id, "title": "Error loading task", "error": str(e)}
-
-def scan_codebase_for_docs() -> Dict[str, Any]:
-    """Scan codebase to identify files that need documentation"""
-    docs_scan = {
-        "files_needing_docs": [],
-        "outdated_docs": [],
-        "missing_readme": [],
-        "api_docs_needed": []
+        yield from _scan_darwin.scan_dir(path)
+    except _scan_darwin.BulkReadUnsupported:
+        # Raised before any entry is yielded, e.g. on network mounts
+        yield from _list_dir_scandir(path)
+
+# Use the native bulk directory reader on macOS, os.scandir elsewhere
+_list_dir = _list_dir_darwin if _scan_darwin.AVAILABLE else _list_dir_scandir
+
+def iter_candidates() -> Iterator[Tuple[str, Optional[int], Optional[int]]]:
+    """Yield (relative path, mtime_ns, size) of TypeScript/JavaScript files; None when not yet known"""
+    # Bind hot names as locals; relative paths are built from a per-directory
+    # prefix instead of going through os.path.join/relpath for every file
+    list_dir = _list_dir
+    skip_dirs = SKIP_DIRS
+    extensions = SOURCE_EXTENSIONS
+    sep = os.sep
+    prefix_len = len(REPO_ROOT_PREFIX)
+    pending = [REPO_ROOT]
+    
+    while pending:
+        dir_prefix = pending.pop() + sep
+        relative_prefix = dir_prefix[prefix_len:]
+        subdirs = []
+        try:
+            for name, is_dir, mtime_ns, size in list_dir(dir_prefix):
+                if is_dir:
+                    # Skip node_modules and other irrelevant directories
+                    if name not in skip_dirs:
+                        subdirs.append(dir_prefix + name)
+                elif name.endswith(extensions):
+                    yield relative_prefix + name, mtime_ns, size
+        except OSError:
+            continue
+        # Reverse so directories are visited in listing order, as os.walk does
+        pending.extend(reversed(subdirs))
+
+def is_api_file(relative_path: str) -> bool:
+    """Check if a file is an API file, using its path only"""
+    lowered = relative_path.lower()
+    return 'api' in lowered or 'route' in lowered
+
+def classify(relative_path: str, mtime_ns: Optional[int] = None, size: Optional[int] = None) -> Dict[str, bool]:
+    """Classify the documentation needs of a single file"""
+    return {
+        # Check if file has JSDoc comments
+        "needs_docs": not has_jsdoc_comments(REPO_ROOT_PREFIX + relative_path, mtime_ns, size),
+        # Check if it's an API file
+        "api_docs": is_api_file(relative_path)
     }
+
+def scan_codebase_for_docs() -> Iterator[Tuple[str, Dict[str, bool]]]:
+    """Lazily scan codebase, yielding each file with its documentation needs"""
+    for relative_path, mtime_ns, size in iter_candidates():
+        yield relative_path, classify(relative_path, mtime_ns, size)
+
+def summarize_docs_scan(scan: Iterator[Tuple[str, Dict[str, bool]]]) -> Dict[str, Any]:
+    """Consume a docs scan into summary counts, keeping only the first API_DOCS_LIMIT API paths"""
+    stats = Counter()
+    api_docs_needed = []
     
-    # Scan for TypeScript/JavaScript files without corresponding docs
-    for root, dirs, files in os.walk(os.path.join(os.path.dirname(__file__), '..')):
-        # Skip node_modules and other irrelevant directories
-        dirs[:] = [d for d in dirs if d not in ['node_modules', '.git', 'coverage', 'dist', 'build']]
-        
-        for file in files:
-            if file.endswith(('.ts', '.tsx', '.js', '.jsx')):
-                file_path = os.path.join(root, file)
-                relative_path = os.path.relpath(file_path, os.path.join(os.path.dirname(__file__), '..'))
-                
-                # Check if file has JSDoc comments
-                if not has_jsdoc_comments(file_path):
-                    docs_scan["files_needing_docs"].append(relative_path)
-                
-                # Check if it's an API file
-                if 'api' in relative_path.lower() or 'route' in relative_path.lower():
-                    docs_scan["api_docs_needed"].append(relative_path)
+    for relative_path, classification in scan:
+        stats["files_scanned"] += 1
+        if classification["needs_docs"]:
+            stats["files_needing_docs"] += 1
+        if classification["api_docs"]:
+            stats["api_files"] += 1
+            if len(api_docs_needed) < API_DOCS_LIMIT:
+                api_docs_needed.append(relative_path)
     
-    return docs_scan
+    return {
+        "files_scanned": stats["files_scanned"],
+        "files_needing_docs": stats["files_needing_docs"],
+        "api_files": stats["api_files"],
+        "api_docs_needed": api_docs_needed
+    }
 
-def has_jsdoc_comments(file_path: str) -> bool:
-    """Check if a file has JSDoc comments"""
+def has_jsdoc_comments(file_path: str, mtime_ns: Optional[int] = None, size: Optional[int] = None) -> bool:
+    """Check if a file has JSDoc comments; stats the file only when the listing gave no mtime/size"""
+    if mtime_ns is None or size is None:
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return False
+        mtime_ns, size = st.st_mtime_ns, st.st_size
+    
+    return _has_jsdoc_cached(file_path, mtime_ns, size)
+
+@functools.lru_cache(maxsize=65536)
+def _has_jsdoc_cached(file_path: str, mtime_ns: int, size: int) -> bool:
+    """Scan a file for JSDoc comments; memoized per (path, mtime, size)"""
+    cached = jsdoc_cache.get(file_path, mtime_ns, size)
+    if cached is not None:
+        return cached
+    
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
             
         # Look for JSDoc comments
         jsdoc_pattern = r'/\*\*[\s\S]*?\*/'
-        return bool(re.search(jsdoc_pattern, content))
+        result = bool(re.search(jsdoc_pattern, content))
     except Exception:
         return False
+    
+    jsdoc_cache.set(file_path, mtime_ns, size, result)
+    return result
 
 def generate_readme_section(task_details: Dict[str, Any]) -> str:
     """Generate README section for a task"""
@@ -91,30 +156,20 @@ def generate_readme_section(task_details: Dict[str, Any]) -> str:
 
 """
     
-    # Add acceptance criteria if available
-    if 'acceptance' in task_details:
-        section += "### Acceptance Criteria\n\n"
-        for criterion in task_details['acceptance']:
-            section += f"- {criterion}\n"
-        section += "\n"
+    parts = [section]
+    append = parts.append
     
-    # Add test information if available
-    if 'tests' in task_details:
-        section += "### Tests\n\n"
-        for test in task_details['tests']:
-            section += f"- {test}\n"
-        section += "\n"
+    # Add acceptance criteria, tests and documentation requirements if available
+    for key, heading in (('acceptance', "Acceptance Criteria"), ('tests', "Tests"), ('docs', "Documentation")):
+        if key in task_details:
+            append(f"### {heading}\n\n")
+            for item in task_details[key]:
+                append(f"- {item}\n")
+            append("\n")
     
-    # Add documentation requirements if available
-    if 'docs' in task_details:
-        section += "### Documentation\n\n"
-        for doc in task_details['docs']:
-            section += f"- {doc}\n"
-        section += "\n"
+    append("### Usage\n\n```typescript\n// Example usage would go here\n```\n\n")
     
-    section += "### Usage\n\n```typescript\n// Example usage would go here\n```\n\n"
-    
-    return section
+    return ''.join(parts)
 
 def generate_api_documentation(file_path: str) -> str:
     """Generate API documentation for a file"""
@@ -125,22 +180,23 @@ def generate_api_documentation(file_path: str) -> str:
         # Extract function definitions
         functions = extract_functions(content)
         
-        doc = f"""# API Documentation: {os.path.basename(file_path)}
+        parts = [f"""# API Documentation: {os.path.basename(file_path)}
 
 ## Functions
 
-"""
+"""]
+        append = parts.append
         
         for func in functions:
-            doc += f"### {func['name']}\n\n"
-            doc += f"**Parameters:** {', '.join(func['params'])}\n\n"
-            doc += f"**Returns:** {func['returns']}\n\n"
-            doc += f"**Description:** {func['description']}\n\n"
-            doc += "```typescript\n"
-            doc += f"{func['signature']}\n"
-            doc += "```\n\n"
+            append(f"### {func['name']}\n\n"
+                   f"**Parameters:** {', '.join(func['params'])}\n\n"
+                   f"**Returns:** {func['returns']}\n\n"
+                   f"**Description:** {func['description']}\n\n"
+                   "```typescript\n"
+                   f"{func['signature']}\n"
+                   "```\n\n")
         
-        return doc
+        return ''.join(parts)
     except Exception as e:
         return f"Error generating API documentation: {str(e)}"
 
@@ -166,6 +222,8 @@ def extract_functions(content: str) -> List[Dict[str, Any]]:
 
 def update_changelog(task_details: Dict[str, Any]) -> str:
     """Update CHANGELOG.md with task information"""
+    from datetime import datetime
+    
     changelog_entry = f"""## [{datetime.now().strftime('%Y-%m-%d')}] - {task_details.get('title', 'Task Update')}
 
 ### Added
@@ -301,6 +359,8 @@ def validate_documentation() -> Dict[str, Any]:
 
 def commit_documentation_changes(task_id: str) -> Dict[str, Any]:
     """Commit documentation changes"""
+    import subprocess
+    
     try:
         # Add documentation files
         subprocess.run(["git", "add", "README.md", "CONTRIBUTING.md", "CHANGELOG.md", "docs/"], check=True)
@@ -334,13 +394,14 @@ def main():
     
     try:
         # Load task details
-        task_details = load_task_details(task_id)
+        task_details = get_task(task_id)
         print(f"✓ Task loaded: {task_details.get('title', 'Unknown')}")
         
         # Scan codebase for documentation needs
         print("Scanning codebase for documentation needs...")
-        docs_scan = scan_codebase_for_docs()
-        print(f"✓ Found {len(docs_scan['files_needing_docs'])} files needing docs")
+        docs_scan = summarize_docs_scan(scan_codebase_for_docs())
+        jsdoc_cache.commit()
+        print(f"✓ Found {docs_scan['files_needing_docs']} files needing docs")
         
         # Generate documentation
         print("Generating documentation...")
@@ -349,10 +410,10 @@ def main():
         readme_section = generate_readme_section(task_details)
         print("✓ README section generated")
         
-        # Generate API documentation for identified files
+        # Generate API documentation for the first few API files, as collected by the scan
         api_docs = {}
-        for file_path in docs_scan["api_docs_needed"][:5]:  # Limit to first 5 files
-            api_docs[file_path] = generate_api_documentation(file_path)
+        for file_path in docs_scan["api_docs_needed"]:
+            api_docs[file_path] = generate_api_documentation(REPO_ROOT_PREFIX + file_path)
         print(f"✓ API documentation generated for {len(api_docs)} files")
         
         # Update changelog
@@ -387,7 +448,7 @@ def main():
             "commit_result": commit_result if autonomy_level == 'autonomous' else None
         }
         
-        print(json.dumps(result, indent=2))
+        print(dumps_indented(result))
         
     except Exception as e:
         error_result = {
@@ -395,7 +456,7 @@ def main():
             "task_id": task_id,
             "error": str(e)
         }
-        print(json.dumps(error_result, indent=2))
+        print(dumps_indented(error_result))
         sys.exit(1)
 
 if __name__ == "__main__":
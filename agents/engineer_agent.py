@@ -6,36 +6,18 @@ Handles implementation of features, bug fixes, and code changes
 
 import os
 import sys
-import json
-import subprocess
-from datetime import datetime
 from typing import Dict, List, Any
 
 # Add mcp_servers to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'mcp_servers'))
 
-def load_task_details(task_id: str) -> Dict[str, Any]:
-    """Load task details from tasks.yaml"""
-    tasks_path = os.path.join(os.path.dirname(__file__), '..', 'agents', 'tasks.yaml')
-    
-    try:
-        import yaml
-        with open(tasks_path, 'r') as f:
-            tasks = yaml.safe_load(f)
-        
-        # Find the specific task
-        for category, items in tasks.items():
-            if isinstance(items, list):
-                for item in items:
-                    if isinstance(item, dict) and item.get('id') == task_id:
-                        return item
-        
-        return {"id": task_id, "title": "Unknown task", "category": "unknown"}
-    except Exception as e:
-        return {"id": task_id, "title": "Error loading task", "error": str(e)}
+from _tasks import get_task
+from _serialize import dumps_indented
 
 def run_lint_check() -> Dict[str, Any]:
     """Run linting checks"""
+    import subprocess
+    
     try:
         result = subprocess.run(
             ["npm", "run", "lint"],
@@ -54,6 +36,8 @@ def run_lint_check() -> Dict[str, Any]:
 
 def run_typecheck() -> Dict[str, Any]:
     """Run TypeScript type checking"""
+    import subprocess
+    
     try:
         result = subprocess.run(
             ["npm", "run", "typecheck"],
@@ -72,6 +56,8 @@ def run_typecheck() -> Dict[str, Any]:
 
 def run_tests() -> Dict[str, Any]:
     """Run test suite"""
+    import subprocess
+    
     try:
         result = subprocess.run(
             ["npm", "run", "test"],
@@ -122,6 +108,8 @@ def implement_feature(task_details: Dict[str, Any]) -> Dict[str, Any]:
 
 def commit_changes(task_id: str, implementation: Dict[str, Any]) -> Dict[str, Any]:
     """Commit changes with conventional commit message"""
+    import subprocess
+    
     try:
         # Add all changes
         subprocess.run(["git", "add", "-A"], check=True)
@@ -148,6 +136,8 @@ def commit_changes(task_id: str, implementation: Dict[str, Any]) -> Dict[str, An
 
 def push_branch(branch_name: str) -> Dict[str, Any]:
     """Push branch to origin"""
+    import subprocess
+    
     try:
         result = subprocess.run(
             ["git", "push", "-u", "origin", branch_name],
@@ -165,6 +155,8 @@ def push_branch(branch_name: str) -> Dict[str, Any]:
 
 def create_pull_request(task_id: str, implementation: Dict[str, Any]) -> Dict[str, Any]:
     """Create a pull request"""
+    import subprocess
+    
     try:
         title = f"feat: {implementation.get('title', f'Implement {task_id}')}"
         body = f"""## Description
@@ -219,7 +211,7 @@ def main():
     
     try:
         # Load task details
-        task_details = load_task_details(task_id)
+        task_details = get_task(task_id)
         print(f"✓ Task loaded: {task_details.get('title', 'Unknown')}")
         
         # Run pre-implementation checks
@@ -276,7 +268,7 @@ def main():
             "pr_result": pr_result if autonomy_level == 'autonomous' else None
         }
         
-        print(json.dumps(result, indent=2))
+        print(dumps_indented(result))
         
     except Exception as e:
         error_result = {
@@ -284,7 +276,7 @@ def main():
             "task_id": task_id,
             "error": str(e)
         }
-        print(json.dumps(error_result, indent=2))
+        print(dumps_indented(error_result))
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -6,20 +6,25 @@ Provides comprehensive error handling, recovery mechanisms, and fault tolerance
 
 import os
 import sys
-import json
 import time
+import random
+import itertools
 import traceback
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Callable
-from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Callable, Iterable, Tuple
+from dataclasses import dataclass
 from enum import Enum
+from types import MappingProxyType
 import threading
 import logging
+from collections import Counter, deque
 from functools import wraps
 
 # Add mcp_servers to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'mcp_servers'))
 
+from _log import setup_queue_logging
+
 class ErrorSeverity(Enum):
     LOW = "low"
     MEDIUM = "medium"
@@ -33,18 +38,40 @@ class RecoveryStrategy(Enum):
     SKIP = "skip"
     RESTART = "restart"
 
-@dataclass
+CRITICAL_ERRORS = frozenset({"SystemExit", "KeyboardInterrupt", "MemoryError"})
+HIGH_ERRORS = frozenset({"ConnectionError", "TimeoutError", "FileNotFoundError"})
+MEDIUM_ERRORS = frozenset({"ValueError", "TypeError", "KeyError"})
+
+# Severity depends only on the error type, so it is resolved once per type
+_severity_cache: Dict[str, ErrorSeverity] = {}
+
+# Window for the "recent_errors" statistic
+RECENT_WINDOW_NS = 3600 * 1_000_000_000
+
+# Only these severities pay for formatting a stack trace
+TRACED_SEVERITIES = frozenset({ErrorSeverity.HIGH, ErrorSeverity.CRITICAL})
+
+# Wake the status reporter every this many errors, or on any of these severities
+REPORT_EVERY_ERRORS = 100
+REPORTED_SEVERITIES = frozenset({ErrorSeverity.HIGH, ErrorSeverity.CRITICAL})
+
+@dataclass(slots=True)
 class ErrorContext:
     error_type: str
     error_message: str
-    stack_trace: str
+    stack_trace: Optional[str]  # None below HIGH severity; the logged record carries the trace
     agent_role: str
     task_id: str
-    timestamp: str
+    timestamp_ns: int  # time.time_ns()
     severity: ErrorSeverity
     context: Dict[str, Any]
+    
+    @property
+    def timestamp(self) -> str:
+        """ISO timestamp, formatted only when needed for output"""
+        return datetime.fromtimestamp(self.timestamp_ns / 1_000_000_000).isoformat()
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RecoveryAction:
     strategy: RecoveryStrategy
     description: str
@@ -52,32 +79,177 @@ class RecoveryAction:
     success_probability: float
     estimated_duration: int  # seconds
 
+# Built-in recovery actions never vary per error, so they are shared
+DEFAULT_RETRY_ACTION = RecoveryAction(
+    strategy=RecoveryStrategy.RETRY,
+    description="Retry the failed operation",
+    parameters={"delay": 5, "max_delay": 60, "jitter": "full"},
+    success_probability=0.6,
+    estimated_duration=5
+)
+
+CIRCUIT_BREAKER_ESCALATION_ACTION = RecoveryAction(
+    strategy=RecoveryStrategy.ESCALATE,
+    description="Escalate to human operator",
+    parameters={"escalation_level": "high"},
+    success_probability=0.9,
+    estimated_duration=300
+)
+
+CONNECTION_RETRY_ACTION = RecoveryAction(
+    strategy=RecoveryStrategy.RETRY,
+    description="Retry connection with exponential backoff",
+    parameters={"delay": 10, "max_delay": 60, "jitter": "full"},
+    success_probability=0.7,
+    estimated_duration=10
+)
+
+FILE_FALLBACK_ACTION = RecoveryAction(
+    strategy=RecoveryStrategy.FALLBACK,
+    description="Use fallback file or create missing file",
+    parameters={"fallback_file": "default.txt"},
+    success_probability=0.8,
+    estimated_duration=5
+)
+
+TIMEOUT_RETRY_ACTION = RecoveryAction(
+    strategy=RecoveryStrategy.RETRY,
+    description="Retry with increased timeout",
+    parameters={"timeout": 60},
+    success_probability=0.6,
+    estimated_duration=60
+)
+
+MEMORY_ESCALATION_ACTION = RecoveryAction(
+    strategy=RecoveryStrategy.ESCALATE,
+    description="Escalate to system administrator",
+    parameters={"escalation_level": "critical"},
+    success_probability=0.9,
+    estimated_duration=300
+)
+
+@dataclass(slots=True)
+class BreakerState:
+    failure_count: int = 0
+    is_open: bool = False
+    opened_at_ns: int = 0  # time.monotonic_ns() when last opened
+
+def monotonic_ns_to_iso(monotonic_ns: int) -> str:
+    """Convert a time.monotonic_ns() reading to a wall-clock ISO timestamp"""
+    wall_ns = time.time_ns() - (time.monotonic_ns() - monotonic_ns)
+    return datetime.fromtimestamp(wall_ns / 1_000_000_000).isoformat()
+
+def default_retry_handler(error_context: ErrorContext) -> Dict[str, Any]:
+    """Default retry handler"""
+    return {
+        "success": True,
+        "strategy": "retry",
+        "message": "Retrying operation",
+        "recovery_action": DEFAULT_RETRY_ACTION
+    }
+
+def connection_error_handler(error_context: ErrorContext) -> Dict[str, Any]:
+    """Handle connection errors"""
+    return {
+        "success": True,
+        "strategy": "retry_with_backoff",
+        "message": "Retrying connection with exponential backoff",
+        "recovery_action": CONNECTION_RETRY_ACTION
+    }
+
+def file_not_found_handler(error_context: ErrorContext) -> Dict[str, Any]:
+    """Handle file not found errors"""
+    return {
+        "success": True,
+        "strategy": "fallback",
+        "message": "Using fallback file or creating missing file",
+        "recovery_action": FILE_FALLBACK_ACTION
+    }
+
+def timeout_handler(error_context: ErrorContext) -> Dict[str, Any]:
+    """Handle timeout errors"""
+    return {
+        "success": True,
+        "strategy": "retry_with_increased_timeout",
+        "message": "Retrying with increased timeout",
+        "recovery_action": TIMEOUT_RETRY_ACTION
+    }
+
+def memory_error_handler(error_context: ErrorContext) -> Dict[str, Any]:
+    """Handle memory errors"""
+    return {
+        "success": False,
+        "strategy": "escalate",
+        "message": "Memory error requires immediate attention",
+        "recovery_action": MEMORY_ESCALATION_ACTION
+    }
+
+# error_type -> (strategy, handler, success_probability)
+DEFAULT_STRATEGIES = MappingProxyType({
+    "ConnectionError": (RecoveryStrategy.RETRY, connection_error_handler, 0.8),
+    "FileNotFoundError": (RecoveryStrategy.FALLBACK, file_not_found_handler, 0.8),
+    "TimeoutError": (RecoveryStrategy.RETRY, timeout_handler, 0.8),
+    "MemoryError": (RecoveryStrategy.ESCALATE, memory_error_handler, 0.8),
+})
+
+# Used for error types without a registered strategy; read-only since it is shared
+DEFAULT_RETRY_STRATEGY = MappingProxyType({
+    "strategy": RecoveryStrategy.RETRY,
+    "handler": default_retry_handler,
+    "success_probability": 0.5
+})
+
+class _StrategyMap(dict):
+    """Registered recovery strategies; unknown error types get the shared default"""
+    
+    def __missing__(self, error_type: str) -> MappingProxyType:
+        return DEFAULT_RETRY_STRATEGY
+
+def compute_retry_delay(parameters: Dict[str, Any], attempt: int = 0) -> float:
+    """Exponential backoff capped at max_delay, with full jitter unless disabled"""
+    base = parameters.get("delay", 5)
+    delay = min(parameters.get("max_delay", 60), base * (2 ** attempt))
+    
+    if parameters.get("jitter", "full") == "full":
+        # Spread retries so agents hit by a shared outage don't wake together
+        delay = random.uniform(0, delay)
+    
+    return delay
+
 class ErrorHandler:
     """Central error handling system"""
     
-    def __init__(self):
-        self.error_history = []
-        self.recovery_strategies = {}
+    def __init__(self, max_history: int = 10000):
+        self.error_history = deque(maxlen=max_history)
+        # Breakdowns over error_history, kept in step with appends and evictions
+        self.severity_counts = Counter()
+        self.agent_counts = Counter()
+        self.error_type_counts = Counter()
+        # time.monotonic_ns() of errors in the last RECENT_WINDOW_NS, oldest first
+        self.recent_error_ns = deque(maxlen=max_history)
+        # Errors recorded since startup, including ones evicted from error_history
+        self.errors_recorded = 0
+        # Set when statistics have changed enough to be worth reporting
+        self.report_event = threading.Event()
+        self.recovery_strategies = _StrategyMap()
         self.circuit_breakers = {}
         self.retry_counts = {}
         self.max_retries = 3
         self.circuit_breaker_threshold = 5
         self.circuit_breaker_timeout = 300  # 5 minutes
-        self.lock = threading.Lock()
+        self.history_lock = threading.Lock()
+        # Per-(agent_role, error_type) locks so unrelated circuits never contend
+        self.shard_locks = {}
+        self.shard_locks_guard = threading.Lock()
         
         # Setup logging
         self.setup_logging()
     
     def setup_logging(self):
-        """Setup error logging"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('agent_errors.log'),
-                logging.StreamHandler()
-            ]
-        )
+        """Setup error logging; file and console writes happen on a listener thread"""
+        self.log_listener = setup_queue_logging('%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                                                log_file='agent_errors.log')
+        
         self.logger = logging.getLogger('ErrorHandler')
     
     def register_recovery_strategy(self, error_type: str, strategy: RecoveryStrategy, 
@@ -89,109 +261,164 @@ class ErrorHandler:
             "success_probability": success_probability
         }
     
+    def get_shard_lock(self, agent_role: str, error_type: str) -> threading.Lock:
+        """Get the lock guarding breaker and retry state for one agent/error type"""
+        shard_key = f"{agent_role}|{error_type}"
+        lock = self.shard_locks.get(shard_key)
+        
+        if lock is None:
+            with self.shard_locks_guard:
+                lock = self.shard_locks.setdefault(shard_key, threading.Lock())
+        
+        return lock
+    
     def handle_error(self, error: Exception, agent_role: str, task_id: str, 
                     context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Handle an error and attempt recovery"""
         error_context = self.create_error_context(error, agent_role, task_id, context)
         
-        with self.lock:
-            self.error_history.append(error_context)
-            
-            # Log the error
-            self.logger.error(f"Error in {agent_role} agent for task {task_id}: {str(error)}")
-            
-            # Check circuit breaker
-            if self.is_circuit_breaker_open(agent_role, error_context.error_type):
+        self.record_error(error_context)
+        
+        # Log the error; logging formats the traceback from exc_info only when a handler emits it,
+        # which keeps the trace for the severities that skip stack_trace
+        self.logger.error(f"Error in {agent_role} agent for task {task_id}: {str(error)}", exc_info=error)
+        
+        error_type = error_context.error_type
+        breaker_key = f"{agent_role}_{error_type}"
+        shard_lock = self.get_shard_lock(agent_role, error_type)
+        
+        # Breaker state is read without the lock; opened_at_ns is written before
+        # is_open, so it is current whenever is_open reads True
+        breaker = self.circuit_breakers.get(breaker_key)
+        if breaker is not None and breaker.is_open:
+            if time.monotonic_ns() - breaker.opened_at_ns <= self.circuit_breaker_timeout * 1_000_000_000:
                 return self.handle_circuit_breaker_open(agent_role, error_context)
-            
-            # Attempt recovery
-            recovery_result = self.attempt_recovery(error_context)
-            
-            # Update circuit breaker
-            self.update_circuit_breaker(agent_role, error_context.error_type, recovery_result["success"])
-            
+            # The timeout has passed: close it under the lock, unless another thread reopened it
+            with shard_lock:
+                if self.breaker_is_open(breaker):
+                    return self.handle_circuit_breaker_open(agent_role, error_context)
+        
+        # Closed breaker: strategy lookup, retry budget check and the handler run unlocked
+        retry_key = f"{agent_role}_{task_id}_{error_type}"
+        recovery_result, handler_ran = self.attempt_recovery(error_context, retry_key)
+        success = recovery_result["success"]
+        
+        # A granted retry spends budget, like a failed recovery
+        recovery_action = recovery_result.get("recovery_action")
+        retry_spent = handler_ran and (not success or (recovery_action is not None and
+                                                       recovery_action.strategy == RecoveryStrategy.RETRY))
+        
+        # A success with no retry count or breaker failures to reset writes nothing
+        if (success and not retry_spent and not self.retry_counts.get(retry_key)
+                and (breaker is None or not (breaker.failure_count or breaker.is_open))):
             return recovery_result
+        
+        # Only the retry count and breaker writes happen under the shard lock
+        with shard_lock:
+            if retry_spent:
+                self.retry_counts[retry_key] = self.retry_counts.get(retry_key, 0) + 1
+            elif handler_ran:
+                self.retry_counts[retry_key] = 0
+            self.record_breaker_outcome(agent_role, error_type, self.circuit_breakers.get(breaker_key), success)
+        
+        return recovery_result
+    
+    def record_error(self, error_context: ErrorContext):
+        """Append to the bounded history and update the breakdown counters"""
+        with self.history_lock:
+            if len(self.error_history) == self.error_history.maxlen:
+                # The oldest entry is about to be evicted; drop it from the counts
+                evicted = self.error_history[0]
+                for counts, key in ((self.severity_counts, evicted.severity.value),
+                                    (self.agent_counts, evicted.agent_role),
+                                    (self.error_type_counts, evicted.error_type)):
+                    counts[key] -= 1
+                    if not counts[key]:
+                        del counts[key]
+            
+            self.error_history.append(error_context)
+            self.recent_error_ns.append(time.monotonic_ns())
+            self.prune_recent_errors()
+            self.severity_counts[error_context.severity.value] += 1
+            self.agent_counts[error_context.agent_role] += 1
+            self.error_type_counts[error_context.error_type] += 1
+            self.errors_recorded += 1
+            notify = (self.errors_recorded % REPORT_EVERY_ERRORS == 0
+                      or error_context.severity in REPORTED_SEVERITIES)
+        
+        if notify:
+            self.report_event.set()
+    
+    def prune_recent_errors(self):
+        """Drop timestamps that have left the recent window; callers hold history_lock"""
+        cutoff_ns = time.monotonic_ns() - RECENT_WINDOW_NS
+        recent_error_ns = self.recent_error_ns
+        while recent_error_ns and recent_error_ns[0] < cutoff_ns:
+            recent_error_ns.popleft()
     
     def create_error_context(self, error: Exception, agent_role: str, task_id: str, 
                            context: Dict[str, Any] = None) -> ErrorContext:
         """Create error context from exception"""
         error_type = type(error).__name__
         error_message = str(error)
-        stack_trace = traceback.format_exc()
         
         # Determine severity based on error type
         severity = self.determine_error_severity(error_type, error_message)
         
+        # Walking and formatting the frames is only worth it for serious errors
+        stack_trace = None
+        if severity in TRACED_SEVERITIES:
+            stack_trace = "".join(traceback.format_exception(error))
+        
         return ErrorContext(
             error_type=error_type,
             error_message=error_message,
             stack_trace=stack_trace,
             agent_role=agent_role,
             task_id=task_id,
-            timestamp=datetime.now().isoformat(),
+            timestamp_ns=time.time_ns(),
             severity=severity,
             context=context or {}
         )
     
     def determine_error_severity(self, error_type: str, error_message: str) -> ErrorSeverity:
         """Determine error severity based on type and message"""
-        critical_errors = ["SystemExit", "KeyboardInterrupt", "MemoryError"]
-        high_errors = ["ConnectionError", "TimeoutError", "FileNotFoundError"]
-        medium_errors = ["ValueError", "TypeError", "KeyError"]
+        severity = _severity_cache.get(error_type)
+        if severity is not None:
+            return severity
         
-        if error_type in critical_errors:
-            return ErrorSeverity.CRITICAL
-        elif error_type in high_errors:
-            return ErrorSeverity.HIGH
-        elif error_type in medium_errors:
-            return ErrorSeverity.MEDIUM
+        if error_type in CRITICAL_ERRORS:
+            severity = ErrorSeverity.CRITICAL
+        elif error_type in HIGH_ERRORS:
+            severity = ErrorSeverity.HIGH
+        elif error_type in MEDIUM_ERRORS:
+            severity = ErrorSeverity.MEDIUM
         else:
-            return ErrorSeverity.LOW
-    
-    def attempt_recovery(self, error_context: ErrorContext) -> Dict[str, Any]:
-        """Attempt to recover from an error"""
-        error_type = error_context.error_type
-        agent_role = error_context.agent_role
-        task_id = error_context.task_id
-        
-        # Get recovery strategy
-        strategy_info = self.recovery_strategies.get(error_type)
+            severity = ErrorSeverity.LOW
         
-        if not strategy_info:
-            # Default recovery strategy
-            strategy_info = {
-                "strategy": RecoveryStrategy.RETRY,
-                "handler": self.default_retry_handler,
-                "success_probability": 0.5
-            }
+        _severity_cache[error_type] = severity
+        return severity
+    
+    def attempt_recovery(self, error_context: ErrorContext, retry_key: str) -> Tuple[Dict[str, Any], bool]:
+        """Attempt to recover from an error without taking locks; also returns whether the handler ran"""
+        # Get recovery strategy; unregistered types resolve to the shared default
+        strategy_info = self.recovery_strategies[error_context.error_type]
         
         strategy = strategy_info["strategy"]
         handler = strategy_info["handler"]
         
         # Check retry count
-        retry_key = f"{agent_role}_{task_id}_{error_type}"
-        retry_count = self.retry_counts.get(retry_key, 0)
-        
-        if retry_count >= self.max_retries:
+        if self.retry_counts.get(retry_key, 0) >= self.max_retries:
             return {
                 "success": False,
                 "strategy": "max_retries_exceeded",
                 "message": f"Maximum retries ({self.max_retries}) exceeded",
                 "recovery_action": None
-            }
+            }, False
         
         # Attempt recovery
         try:
-            recovery_result = handler(error_context)
-            
-            if recovery_result["success"]:
-                # Reset retry count on success
-                self.retry_counts[retry_key] = 0
-            else:
-                # Increment retry count on failure
-                self.retry_counts[retry_key] = retry_count + 1
-            
-            return recovery_result
+            return handler(error_context), True
             
         except Exception as recovery_error:
             self.logger.error(f"Recovery attempt failed: {str(recovery_error)}")
@@ -200,65 +427,66 @@ class ErrorHandler:
                 "strategy": strategy.value,
                 "message": f"Recovery failed: {str(recovery_error)}",
                 "recovery_action": None
-            }
+            }, False
+    
+    def reset_retries(self, agent_role: str, task_id: str, error_types: Iterable[str]):
+        """Restore a task's full retry budget for the given error types"""
+        for error_type in error_types:
+            retry_key = f"{agent_role}_{task_id}_{error_type}"
+            if self.retry_counts.get(retry_key):
+                with self.get_shard_lock(agent_role, error_type):
+                    self.retry_counts[retry_key] = 0
     
     def default_retry_handler(self, error_context: ErrorContext) -> Dict[str, Any]:
         """Default retry handler"""
-        return {
-            "success": True,
-            "strategy": "retry",
-            "message": "Retrying operation",
-            "recovery_action": RecoveryAction(
-                strategy=RecoveryStrategy.RETRY,
-                description="Retry the failed operation",
-                parameters={"delay": 5},
-                success_probability=0.6,
-                estimated_duration=5
-            )
-        }
+        return default_retry_handler(error_context)
     
-    def is_circuit_breaker_open(self, agent_role: str, error_type: str) -> bool:
-        """Check if circuit breaker is open"""
-        breaker_key = f"{agent_role}_{error_type}"
-        breaker_info = self.circuit_breakers.get(breaker_key)
-        
-        if not breaker_info:
+    def breaker_is_open(self, breaker: Optional[BreakerState]) -> bool:
+        """Check a breaker, closing it in place once its timeout has passed"""
+        # Plain attribute loads; closed breakers need no lock to read
+        if breaker is None or not breaker.is_open:
             return False
         
         # Check if timeout has passed
-        if datetime.now() - breaker_info["opened_at"] > timedelta(seconds=self.circuit_breaker_timeout):
+        if time.monotonic_ns() - breaker.opened_at_ns > self.circuit_breaker_timeout * 1_000_000_000:
             # Reset circuit breaker
-            del self.circuit_breakers[breaker_key]
+            breaker.failure_count = 0
+            breaker.is_open = False
             return False
         
-        return breaker_info["is_open"]
+        return True
     
-    def update_circuit_breaker(self, agent_role: str, error_type: str, success: bool):
-        """Update circuit breaker state"""
-        breaker_key = f"{agent_role}_{error_type}"
+    def is_circuit_breaker_open(self, agent_role: str, error_type: str) -> bool:
+        """Check if circuit breaker is open"""
+        return self.breaker_is_open(self.circuit_breakers.get(f"{agent_role}_{error_type}"))
+    
+    def record_breaker_outcome(self, agent_role: str, error_type: str,
+                               breaker: Optional[BreakerState], success: bool):
+        """Apply a recovery outcome to a breaker; callers hold the shard lock"""
+        if success:
+            # Success only disarms a breaker that has recorded failures
+            if breaker is not None and (breaker.failure_count or breaker.is_open):
+                breaker.failure_count = 0
+                breaker.is_open = False
+            return
         
-        if breaker_key not in self.circuit_breakers:
-            self.circuit_breakers[breaker_key] = {
-                "failure_count": 0,
-                "is_open": False,
-                "opened_at": None
-            }
+        if breaker is None:
+            breaker = self.circuit_breakers.setdefault(f"{agent_role}_{error_type}", BreakerState())
         
-        breaker_info = self.circuit_breakers[breaker_key]
+        # Increment failure count
+        breaker.failure_count += 1
         
-        if success:
-            # Reset failure count on success
-            breaker_info["failure_count"] = 0
-            breaker_info["is_open"] = False
-        else:
-            # Increment failure count
-            breaker_info["failure_count"] += 1
-            
-            # Open circuit breaker if threshold exceeded
-            if breaker_info["failure_count"] >= self.circuit_breaker_threshold:
-                breaker_info["is_open"] = True
-                breaker_info["opened_at"] = datetime.now()
-                self.logger.warning(f"Circuit breaker opened for {agent_role} - {error_type}")
+        # Open circuit breaker once the threshold is crossed
+        if not breaker.is_open and breaker.failure_count >= self.circuit_breaker_threshold:
+            breaker.opened_at_ns = time.monotonic_ns()
+            breaker.is_open = True
+            self.logger.warning(f"Circuit breaker opened for {agent_role} - {error_type}")
+    
+    def update_circuit_breaker(self, agent_role: str, error_type: str, success: bool):
+        """Update circuit breaker state"""
+        with self.get_shard_lock(agent_role, error_type):
+            breaker = self.circuit_breakers.get(f"{agent_role}_{error_type}")
+            self.record_breaker_outcome(agent_role, error_type, breaker, success)
     
     def handle_circuit_breaker_open(self, agent_role: str, error_context: ErrorContext) -> Dict[str, Any]:
         """Handle when circuit breaker is open"""
@@ -266,153 +494,88 @@ class ErrorHandler:
             "success": False,
             "strategy": "circuit_breaker_open",
             "message": f"Circuit breaker is open for {agent_role} - {error_context.error_type}",
-            "recovery_action": RecoveryAction(
-                strategy=RecoveryStrategy.ESCALATE,
-                description="Escalate to human operator",
-                parameters={"escalation_level": "high"},
-                success_probability=0.9,
-                estimated_duration=300
-            )
+            "recovery_action": CIRCUIT_BREAKER_ESCALATION_ACTION
+        }
+    
+    def get_circuit_breaker_status(self) -> Dict[str, Dict[str, Any]]:
+        """Status of each breaker, built from a snapshot of the breakers"""
+        # Copying the items is a single C-level operation; no shard lock is held
+        return {
+            breaker_key: {
+                "is_open": breaker.is_open,
+                "failure_count": breaker.failure_count,
+                "opened_at": monotonic_ns_to_iso(breaker.opened_at_ns) if breaker.opened_at_ns else None
+            }
+            for breaker_key, breaker in list(self.circuit_breakers.items())
         }
     
     def get_error_statistics(self) -> Dict[str, Any]:
         """Get error statistics"""
-        with self.lock:
+        # Snapshot shared state; no shard lock is held while aggregating
+        with self.history_lock:
             total_errors = len(self.error_history)
-            
-            if total_errors == 0:
-                return {"total_errors": 0}
-            
-            # Count by severity
-            severity_counts = {}
-            for error in self.error_history:
-                severity = error.severity.value
-                severity_counts[severity] = severity_counts.get(severity, 0) + 1
-            
-            # Count by agent
-            agent_counts = {}
-            for error in self.error_history:
-                agent = error.agent_role
-                agent_counts[agent] = agent_counts.get(agent, 0) + 1
-            
-            # Count by error type
-            error_type_counts = {}
-            for error in self.error_history:
-                error_type = error.error_type
-                error_type_counts[error_type] = error_type_counts.get(error_type, 0) + 1
-            
-            # Recent errors (last hour)
-            recent_cutoff = datetime.now() - timedelta(hours=1)
-            recent_errors = [
-                error for error in self.error_history
-                if datetime.fromisoformat(error.timestamp) > recent_cutoff
-            ]
-            
-            return {
-                "total_errors": total_errors,
-                "recent_errors": len(recent_errors),
-                "severity_breakdown": severity_counts,
-                "agent_breakdown": agent_counts,
-                "error_type_breakdown": error_type_counts,
-                "circuit_breakers_open": len([cb for cb in self.circuit_breakers.values() if cb["is_open"]]),
-                "active_retry_counts": dict(self.retry_counts)
-            }
+            self.prune_recent_errors()
+            recent_errors = len(self.recent_error_ns)
+            severity_counts = dict(self.severity_counts)
+            agent_counts = dict(self.agent_counts)
+            error_type_counts = dict(self.error_type_counts)
+        breakers = list(self.circuit_breakers.values())
+        retry_counts = dict(self.retry_counts)
+        
+        if total_errors == 0:
+            return {"total_errors": 0}
+        
+        return {
+            "total_errors": total_errors,
+            "recent_errors": recent_errors,
+            "severity_breakdown": severity_counts,
+            "agent_breakdown": agent_counts,
+            "error_type_breakdown": error_type_counts,
+            "circuit_breakers_open": len([cb for cb in breakers if cb.is_open]),
+            "active_retry_counts": retry_counts
+        }
 
 # Global error handler instance
 error_handler = ErrorHandler()
 
-def error_handler_decorator(agent_role: str, task_id: str = None):
-    """Decorator for automatic error handling"""
+def error_handler_decorator(agent_role: str, task_id: str = None,
+                            sleep: Callable[[float], None] = time.sleep):
+    """Decorator for automatic error handling; `sleep` waits out each retry delay"""
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
+            task = task_id or "unknown"
+            error_types = set()
             try:
-                return func(*args, **kwargs)
-            except Exception as e:
-                # Handle the error
-                recovery_result = error_handler.handle_error(e, agent_role, task_id or "unknown")
-                
-                if recovery_result["success"]:
-                    # Retry the function if recovery was successful
-                    recovery_action = recovery_result.get("recovery_action")
-                    if recovery_action and recovery_action.strategy == RecoveryStrategy.RETRY:
-                        time.sleep(recovery_action.parameters.get("delay", 5))
+                # handle_error grants at most max_retries retries per error type,
+                # so its retry budget ends the loop; each retry backs off further
+                for attempt in itertools.count():
+                    try:
                         return func(*args, **kwargs)
-                
-                # If recovery failed or strategy doesn't involve retry, re-raise
-                raise e
+                    except Exception as e:
+                        error_types.add(type(e).__name__)
+                        # Handle the error
+                        recovery_result = error_handler.handle_error(e, agent_role, task, {"attempt": attempt})
+                        
+                        # Re-raise if recovery failed (max_retries_exceeded included)
+                        # or the strategy doesn't involve retry
+                        recovery_action = recovery_result.get("recovery_action")
+                        if (not recovery_result["success"] or not recovery_action
+                                or recovery_action.strategy != RecoveryStrategy.RETRY):
+                            raise
+                        
+                        sleep(compute_retry_delay(recovery_action.parameters, attempt))
+            finally:
+                # The budget is per call; the next call starts with all of it
+                error_handler.reset_retries(agent_role, task, error_types)
         
         return wrapper
     return decorator
 
 def register_default_recovery_strategies():
     """Register default recovery strategies"""
-    
-    def connection_error_handler(error_context: ErrorContext) -> Dict[str, Any]:
-        """Handle connection errors"""
-        return {
-            "success": True,
-            "strategy": "retry_with_backoff",
-            "message": "Retrying connection with exponential backoff",
-            "recovery_action": RecoveryAction(
-                strategy=RecoveryStrategy.RETRY,
-                description="Retry connection with exponential backoff",
-                parameters={"delay": 10, "max_delay": 60},
-                success_probability=0.7,
-                estimated_duration=10
-            )
-        }
-    
-    def file_not_found_handler(error_context: ErrorContext) -> Dict[str, Any]:
-        """Handle file not found errors"""
-        return {
-            "success": True,
-            "strategy": "fallback",
-            "message": "Using fallback file or creating missing file",
-            "recovery_action": RecoveryAction(
-                strategy=RecoveryStrategy.FALLBACK,
-                description="Use fallback file or create missing file",
-                parameters={"fallback_file": "default.txt"},
-                success_probability=0.8,
-                estimated_duration=5
-            )
-        }
-    
-    def timeout_handler(error_context: ErrorContext) -> Dict[str, Any]:
-        """Handle timeout errors"""
-        return {
-            "success": True,
-            "strategy": "retry_with_increased_timeout",
-            "message": "Retrying with increased timeout",
-            "recovery_action": RecoveryAction(
-                strategy=RecoveryStrategy.RETRY,
-                description="Retry with increased timeout",
-                parameters={"timeout": 60},
-                success_probability=0.6,
-                estimated_duration=60
-            )
-        }
-    
-    def memory_error_handler(error_context: ErrorContext) -> Dict[str, Any]:
-        """Handle memory errors"""
-        return {
-            "success": False,
-            "strategy": "escalate",
-            "message": "Memory error requires immediate attention",
-            "recovery_action": RecoveryAction(
-                strategy=RecoveryStrategy.ESCALATE,
-                description="Escalate to system administrator",
-                parameters={"escalation_level": "critical"},
-                success_probability=0.9,
-                estimated_duration=300
-            )
-        }
-    
-    # Register strategies
-    error_handler.register_recovery_strategy("ConnectionError", RecoveryStrategy.RETRY, connection_error_handler)
-    error_handler.register_recovery_strategy("FileNotFoundError", RecoveryStrategy.FALLBACK, file_not_found_handler)
-    error_handler.register_recovery_strategy("TimeoutError", RecoveryStrategy.RETRY, timeout_handler)
-    error_handler.register_recovery_strategy("MemoryError", RecoveryStrategy.ESCALATE, memory_error_handler)
+    for error_type, (strategy, handler, success_probability) in DEFAULT_STRATEGIES.items():
+        error_handler.register_recovery_strategy(error_type, strategy, handler, success_probability)
 
 def create_error_report() -> Dict[str, Any]:
     """Create comprehensive error report"""
@@ -423,14 +586,7 @@ def create_error_report() -> Dict[str, Any]:
         "generated_at": datetime.now().isoformat(),
         "summary": stats,
         "recommendations": generate_error_recommendations(stats),
-        "circuit_breaker_status": {
-            breaker_key: {
-                "is_open": breaker_info["is_open"],
-                "failure_count": breaker_info["failure_count"],
-                "opened_at": breaker_info["opened_at"].isoformat() if breaker_info["opened_at"] else None
-            }
-            for breaker_key, breaker_info in error_handler.circuit_breakers.items()
-        }
+        "circuit_breaker_status": error_handler.get_circuit_breaker_status()
     }
 
 def generate_error_recommendations(stats: Dict[str, Any]) -> List[str]:
@@ -465,7 +621,8 @@ def main():
     # Test error handling
     print("Testing error handling...")
     
-    @error_handler_decorator("test_agent", "test_task")
+    # Skip the real backoff, which can reach max_delay (60s), in the demo
+    @error_handler_decorator("test_agent", "test_task", sleep=lambda delay: None)
     def test_function():
         raise ConnectionError("Test connection error")
     
@@ -484,10 +641,11 @@ def main():
     
     print("Error handling and recovery system is running...")
     
-    # Keep the system running
+    # Keep the system running; report when the handler signals, or at least every 5 minutes
     try:
         while True:
-            time.sleep(60)
+            error_handler.report_event.wait(timeout=300)
+            error_handler.report_event.clear()
             stats = error_handler.get_error_statistics()
             print(f"Error handling status: {stats['total_errors']} errors, {stats['circuit_breakers_open']} circuit breakers open")
     except KeyboardInterrupt:
@@ -6,22 +6,17 @@ Handles task planning, issue triage, and work coordination
 
 import os
 import sys
-import json
-import yaml
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 import subprocess
 
 # Add mcp_servers to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'mcp_servers'))
 
-def load_tasks() -> Dict[str, Any]:
-    """Load tasks from agents/tasks.yaml"""
-    tasks_path = os.path.join(os.path.dirname(__file__), '..', 'agents', 'tasks.yaml')
-    with open(tasks_path, 'r') as f:
-        return yaml.safe_load(f)
+from _tasks import load_task_index
+from _serialize import dumps_indented
 
-def create_plan(tasks: Dict[str, Any], task_id: str) -> Dict[str, Any]:
+def create_plan(task_index: Dict[str, Tuple[str, Dict[str, Any]]], task_id: str) -> Dict[str, Any]:
     """Create a work plan based on tasks"""
     plan = {
         "timestamp": datetime.now().isoformat(),
@@ -33,16 +28,15 @@ def create_plan(tasks: Dict[str, Any], task_id: str) -> Dict[str, Any]:
     }
     
     # Prioritize tasks by impact/effort
-    for category, items in tasks.items():
-        if isinstance(items, list):
-            for item in items:
-                if isinstance(item, dict) and item.get('id') == task_id:
-                    plan["priorities"].append({
-                        "id": item['id'],
-                        "title": item.get('title', ''),
-                        "category": category,
-                        "priority": "high" if category in ['bugs', 'security'] else "medium"
-                    })
+    entry = task_index.get(task_id)
+    if entry is not None:
+        category, item = entry
+        plan["priorities"].append({
+            "id": item['id'],
+            "title": item.get('title', ''),
+            "category": category,
+            "priority": "high" if category in ['bugs', 'security'] else "medium"
+        })
     
     return plan
 
@@ -70,26 +64,46 @@ def spawn_subtasks(plan: Dict[str, Any]) -> List[str]:
     
     return subtasks
 
+def update_branch_refs(branches: List[str]) -> subprocess.CompletedProcess:
+    """Point refs/heads/<branch> at HEAD for each branch in one git ref transaction"""
+    # `update` creates the branch or resets an existing one, like `git checkout -B`
+    commands = "".join(f"update refs/heads/{branch} HEAD\n" for branch in branches)
+    return subprocess.run(
+        ["git", "update-ref", "--stdin"],
+        input=commands,
+        capture_output=True,
+        text=True,
+        check=False
+    )
+
 def create_branches(subtasks: List[str]) -> Dict[str, str]:
-    """Create branches for subtasks"""
-    results = {}
+    """Create branches for subtasks at HEAD using a single git process"""
+    if not subtasks:
+        return {}
+    
+    try:
+        result = update_branch_refs(subtasks)
+    except Exception as e:
+        return {subtask: f"error: {str(e)}" for subtask in subtasks}
+    
+    if result.returncode == 0:
+        return {subtask: "created" for subtask in subtasks}
     
+    # The transaction is all-or-nothing, so one bad name (e.g. an invalid ref
+    # format) aborts every branch; retry each on its own to create the rest
+    # and to attribute every error to the branch that caused it
+    results = {}
     for subtask in subtasks:
         try:
-            # Create branch
-            result = subprocess.run(
-                ["git", "checkout", "-B", subtask],
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode == 0:
-                results[subtask] = "created"
-            else:
-                results[subtask] = f"failed: {result.stderr}"
-                
+            result = update_branch_refs([subtask])
         except Exception as e:
             results[subtask] = f"error: {str(e)}"
+            continue
+        
+        if result.returncode == 0:
+            results[subtask] = "created"
+        else:
+            results[subtask] = f"failed: {result.stderr.strip()}"
     
     return results
 
@@ -99,27 +113,28 @@ def update_plan_file(plan: Dict[str, Any]) -> str:
     plan_filename = f"PLAN-{timestamp}.md"
     plan_path = os.path.join(os.path.dirname(__file__), '..', 'agents', 'outbox', plan_filename)
     
-    plan_content = f"""# Agent Work Plan - {plan['task_id']}
+    parts = [f"""# Agent Work Plan - {plan['task_id']}
 
 **Generated:** {plan['timestamp']}
 **Task ID:** {plan['task_id']}
 
 ## Priorities
 
-"""
+"""]
     
-    for priority in plan["priorities"]:
-        plan_content += f"- **{priority['priority'].upper()}**: {priority['title']} ({priority['category']})\n"
+    parts.extend(
+        f"- **{priority['priority'].upper()}**: {priority['title']} ({priority['category']})\n"
+        for priority in plan["priorities"]
+    )
     
-    plan_content += f"""
+    parts.append("""
 ## Subtasks Created
 
-"""
+""")
     
-    for subtask in plan.get("subtasks", []):
-        plan_content += f"- `{subtask}`\n"
+    parts.extend(f"- `{subtask}`\n" for subtask in plan.get("subtasks", []))
     
-    plan_content += f"""
+    parts.append("""
 ## Next Steps
 
 1. Review and approve subtasks
@@ -133,7 +148,9 @@ def update_plan_file(plan: Dict[str, Any]) -> str:
 - [ ] Subtasks assigned
 - [ ] Work in progress
 - [ ] Completed
-"""
+""")
+    
+    plan_content = "".join(parts)
     
     with open(plan_path, 'w') as f:
         f.write(plan_content)
@@ -150,11 +167,11 @@ def main():
     
     try:
         # Load tasks
-        tasks = load_tasks()
+        task_index = load_task_index()
         print("✓ Tasks loaded successfully")
         
         # Create plan
-        plan = create_plan(tasks, task_id)
+        plan = create_plan(task_index, task_id)
         print("✓ Work plan created")
         
         # Spawn subtasks
@@ -180,7 +197,7 @@ def main():
             "plan_file": plan_path
         }
         
-        print(json.dumps(result, indent=2))
+        print(dumps_indented(result))
         
     except Exception as e:
         error_result = {
@@ -188,7 +205,7 @@ def main():
             "task_id": task_id,
             "error": str(e)
         }
-        print(json.dumps(error_result, indent=2))
+        print(dumps_indented(error_result))
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -6,25 +6,48 @@ Uses ML algorithms to intelligently prioritize and schedule tasks for optimal ag
 
 import os
 import sys
-import json
+import re
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from datetime import datetime
+from collections import defaultdict, deque
+from typing import Dict, List, Any, Optional, Tuple, Iterator
+from dataclasses import dataclass
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
 from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, r2_score
 import joblib
 import threading
-import time
+from functools import lru_cache
+from itertools import compress
+
+try:
+    # Optional: gradient-boosted duration model, smaller and faster than a random forest
+    import lightgbm as lgb
+except ImportError:
+    lgb = None
+
+try:
+    # Optional: run the tree ensembles through ONNX Runtime instead of sklearn
+    import onnxruntime as ort
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+except ImportError:
+    ort = None
+
+try:
+    # Optional: LZ4 compresses model pickles several times faster than zlib
+    import lz4.frame  # noqa: F401  (used by joblib)
+    MODEL_COMPRESSION = ('lz4', 3)
+except ImportError:
+    MODEL_COMPRESSION = ('zlib', 3)
 
 # Add mcp_servers to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'mcp_servers'))
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TaskFeatures:
     """Features extracted from tasks for ML prioritization"""
     task_id: str
@@ -43,7 +66,32 @@ class TaskFeatures:
     documentation_needs: float
     security_impact: float
 
-@dataclass
+# ISO 8601 times carrying a UTC offset; these can't be compared with the naive local clock
+AWARE_TIME_PATTERN = re.compile(r'\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}(?::?\d{2})?)$')
+
+# Most recent historical tasks kept for training
+MAX_HISTORY = 100_000
+
+# Where trained models are saved and loaded from
+MODEL_PATH = "ml_models/task_prioritizer.pkl"
+
+# Models served through ONNX Runtime when it is installed
+ONNX_MODELS = ('duration', 'success_probability')
+
+# Numeric TaskFeatures columns, in model input order (category_encoded is appended)
+FEATURE_COLUMNS = [
+    'complexity_score', 'estimated_duration', 'dependencies_count',
+    'agent_experience', 'priority_score', 'deadline_urgency',
+    'resource_requirements', 'risk_score', 'business_value',
+    'technical_debt', 'test_coverage', 'documentation_needs',
+    'security_impact'
+]
+
+# Risk factor names, in the order identify_risk_factors checks them
+RISK_FACTORS = ('high_risk', 'high_complexity', 'many_dependencies',
+                'urgent_deadline', 'high_resource_requirements')
+
+@dataclass(slots=True, frozen=True)
 class TaskPrediction:
     """ML prediction results for task prioritization"""
     task_id: str
@@ -72,106 +120,224 @@ class TaskFeatureExtractor:
             'maintenance': 0.5,
             'docs': 0.3
         }
-    
-    def extract_features(self, task: Dict[str, Any], historical_data: List[Dict[str, Any]] = None) -> TaskFeatures:
-        """Extract features from a task"""
-        task_id = task.get('id', 'unknown')
-        category = task.get('category', 'unknown')
-        title = task.get('title', '')
-        description = task.get('description', '')
-        
-        # Calculate complexity score based on keywords
-        complexity_score = self.calculate_complexity_score(title, description)
-        
-        # Estimate duration based on historical data
-        estimated_duration = self.estimate_duration(task, historical_data)
-        
-        # Count dependencies
-        dependencies_count = len(task.get('dependencies', []))
-        
-        # Calculate agent experience (placeholder - would be based on historical performance)
-        agent_experience = 0.7  # Default experience level
-        
-        # Calculate priority score
-        priority_score = self.calculate_priority_score(task)
         
-        # Calculate deadline urgency
-        deadline_urgency = self.calculate_deadline_urgency(task)
-        
-        # Calculate resource requirements
-        resource_requirements = self.calculate_resource_requirements(task)
-        
-        # Calculate risk score
-        risk_score = self.calculate_risk_score(task)
-        
-        # Calculate business value
-        business_value = self.calculate_business_value(task)
-        
-        # Calculate technical debt
-        technical_debt = self.calculate_technical_debt(task)
+        self.default_durations = {
+            'bugs': 2.0,  # hours
+            'features': 8.0,
+            'security': 4.0,
+            'maintenance': 3.0,
+            'docs': 1.0
+        }
         
-        # Calculate test coverage needs
-        test_coverage = self.calculate_test_coverage_needs(task)
+        self.category_values = {
+            'security': 0.9,
+            'features': 0.8,
+            'bugs': 0.7,
+            'maintenance': 0.5,
+            'docs': 0.3
+        }
         
-        # Calculate documentation needs
-        documentation_needs = self.calculate_documentation_needs(task)
+        self.resource_keywords = ['database', 'api', 'integration', 'performance', 'scalability']
         
-        # Calculate security impact
-        security_impact = self.calculate_security_impact(task)
+        # One case-insensitive alternation per keyword list, so each scan is a single regex pass
+        self.complexity_patterns = {
+            level: self.compile_keywords(keywords)
+            for level, keywords in self.complexity_keywords.items()
+        }
+        self.resource_pattern = self.compile_keywords(self.resource_keywords)
+        self.auth_pattern = self.compile_keywords(['authentication', 'authorization'])
+        
+        # Running per-category totals of historical actual_duration; readers take
+        # the lock too, so a sum is never paired with another update's count
+        self.duration_sums = defaultdict(float)
+        self.duration_counts = defaultdict(int)
+        self.duration_lock = threading.Lock()
+    
+    def record_duration(self, category: str, duration: float):
+        """Fold a historical task's duration into the per-category means"""
+        with self.duration_lock:
+            self.duration_sums[category] += duration
+            self.duration_counts[category] += 1
+    
+    def forget_duration(self, category: str, duration: float):
+        """Remove an evicted historical task's duration from the per-category means"""
+        with self.duration_lock:
+            self.duration_counts[category] -= 1
+            if self.duration_counts[category]:
+                self.duration_sums[category] -= duration
+            else:
+                del self.duration_counts[category]
+                del self.duration_sums[category]
+    
+    def mean_durations(self) -> Dict[str, float]:
+        """Snapshot of the historical mean duration per category; empty without history"""
+        with self.duration_lock:
+            return {category: self.duration_sums[category] / count
+                    for category, count in self.duration_counts.items()}
+    
+    @staticmethod
+    def compile_keywords(keywords: List[str]) -> re.Pattern:
+        """Compile keywords into one case-insensitive substring alternation"""
+        return re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+    
+    def extract_features_batch(self, tasks: List[Dict[str, Any]], now: Optional[datetime] = None) -> pd.DataFrame:
+        """Extract features for many tasks at once; one row per task, columns as in TaskFeatures"""
+        df = pd.DataFrame(tasks, index=range(len(tasks)))
+        
+        def column(name: str, default: Any) -> pd.Series:
+            if name not in df:
+                return pd.Series(default, index=df.index, dtype=object)
+            return df[name].where(df[name].notna(), default)
+        
+        def list_column(name: str) -> pd.Series:
+            if name not in df:
+                return pd.Series([[]] * len(df), index=df.index, dtype=object)
+            return df[name].map(lambda value: value if isinstance(value, list) else [])
+        
+        def has_item(values: pd.Series, item: str) -> pd.Series:
+            exploded = values.explode()
+            return exploded.eq(item).groupby(level=0).any().reindex(df.index, fill_value=False)
+        
+        def distinct_matches(text: pd.Series, pattern: re.Pattern) -> pd.Series:
+            # One pass of the precompiled alternation per row; each keyword counts once
+            return text.str.findall(pattern).map(lambda matches: len(set(matches)))
+        
+        category = column('category', 'unknown')
+        title = column('title', '').astype(str)
+        lower_title = title.str.lower()
+        text = (title + ' ' + column('description', '').astype(str)).str.lower()
+        labels = list_column('labels')
+        dependencies_count = list_column('dependencies').map(len)
+        
+        # Each keyword counts once per task, weighted by its complexity bucket
+        complexity_score = np.minimum((distinct_matches(text, self.complexity_patterns['high']) * 3 +
+                                       distinct_matches(text, self.complexity_patterns['medium']) * 2 +
+                                       distinct_matches(text, self.complexity_patterns['low'])) / 10, 1.0)
+        
+        mean_durations = self.mean_durations()
+        if mean_durations:
+            estimated_duration = category.map(mean_durations).fillna(4.0)
+        else:
+            estimated_duration = category.map(self.default_durations).fillna(4.0)
+        
+        priority_score = (category.map(self.category_weights).fillna(0.5)
+                          + has_item(labels, 'urgent') * 0.2
+                          + has_item(labels, 'critical') * 0.3
+                          - has_item(labels, 'low-priority') * 0.2).clip(0.0, 1.0)
+        
+        # Missing, empty, non-string, offset-aware and unparseable deadlines all become NaT, i.e. no urgency
+        deadline = column('deadline', None)
+        deadline = deadline.where(deadline.map(lambda value: isinstance(value, str)))
+        deadline = deadline.where(~deadline.str.contains(AWARE_TIME_PATTERN, na=False))
+        deadline_date = pd.to_datetime(deadline, errors='coerce', format='ISO8601')
+        days_until_deadline = (deadline_date - pd.Timestamp(now or datetime.now())).dt.days
+        deadline_urgency = pd.Series(
+            np.select([days_until_deadline <= 0, days_until_deadline <= 1,
+                       days_until_deadline <= 3, days_until_deadline <= 7],
+                      [1.0, 0.9, 0.7, 0.5], default=0.2),
+            index=df.index
+        ).where(days_until_deadline.notna(), 0.0)
+        
+        requirements = list_column('requirements').explode().dropna().astype(str)
+        resource_count = requirements.str.contains(self.resource_pattern).groupby(level=0).sum()
+        resource_requirements = np.minimum(resource_count.reindex(df.index, fill_value=0) / 5.0, 1.0)
+        
+        risk_score = np.minimum(column('complexity', 'medium').eq('high') * 0.3
+                                + (dependencies_count > 3) * 0.2
+                                + category.eq('security') * 0.2, 1.0)
+        
+        business_value = category.map(self.category_values).fillna(0.5)
+        
+        technical_debt = np.select([has_item(labels, 'technical-debt'),
+                                    lower_title.str.contains('refactor', regex=False)],
+                                   [0.8, 0.6], default=0.2)
+        
+        test_coverage = np.select([category.eq('bugs'), lower_title.str.contains('test', regex=False)],
+                                  [0.9, 0.8], default=0.5)
+        
+        documentation_needs = np.select([category.eq('docs'), lower_title.str.contains('api', regex=False)],
+                                        [1.0, 0.8], default=0.3)
+        
+        security_impact = np.select([category.eq('security'),
+                                     lower_title.str.contains('security', regex=False),
+                                     title.str.contains(self.auth_pattern)],
+                                    [1.0, 0.8, 0.6], default=0.1)
+        
+        return pd.DataFrame({
+            'task_id': column('id', 'unknown'),
+            'category': category,
+            'complexity_score': complexity_score,
+            'estimated_duration': estimated_duration,
+            'dependencies_count': dependencies_count,
+            'agent_experience': 0.7,  # Default experience level
+            'priority_score': priority_score,
+            'deadline_urgency': deadline_urgency,
+            'resource_requirements': resource_requirements,
+            'risk_score': risk_score,
+            'business_value': business_value,
+            'technical_debt': technical_debt,
+            'test_coverage': test_coverage,
+            'documentation_needs': documentation_needs,
+            'security_impact': security_impact
+        }, index=df.index)
+    
+    def iter_task_features(self, features_df: pd.DataFrame) -> Iterator[TaskFeatures]:
+        """Yield a TaskFeatures per row of an extract_features_batch frame"""
+        for row in features_df.itertuples(index=False, name=None):
+            yield TaskFeatures(*row)
+    
+    def extract_features(self, task: Dict[str, Any], now: Optional[datetime] = None) -> TaskFeatures:
+        """Extract features from a task; pass `now` to share one clock reading across a batch"""
+        title = task.get('title', '')
+        description = task.get('description', '')
         
         return TaskFeatures(
-            task_id=task_id,
-            category=category,
-            complexity_score=complexity_score,
-            estimated_duration=estimated_duration,
-            dependencies_count=dependencies_count,
-            agent_experience=agent_experience,
-            priority_score=priority_score,
-            deadline_urgency=deadline_urgency,
-            resource_requirements=resource_requirements,
-            risk_score=risk_score,
-            business_value=business_value,
-            technical_debt=technical_debt,
-            test_coverage=test_coverage,
-            documentation_needs=documentation_needs,
-            security_impact=security_impact
+            task_id=task.get('id', 'unknown'),
+            category=task.get('category', 'unknown'),
+            # Calculate complexity score based on keywords
+            complexity_score=self.calculate_complexity_score(title, description),
+            estimated_duration=self.estimate_duration(task),
+            dependencies_count=len(task.get('dependencies', [])),
+            # Placeholder - would be based on historical performance
+            agent_experience=0.7,  # Default experience level
+            priority_score=self.calculate_priority_score(task),
+            deadline_urgency=self.calculate_deadline_urgency(task, now),
+            resource_requirements=self.calculate_resource_requirements(task),
+            risk_score=self.calculate_risk_score(task),
+            business_value=self.calculate_business_value(task),
+            technical_debt=self.calculate_technical_debt(task),
+            test_coverage=self.calculate_test_coverage_needs(task),
+            documentation_needs=self.calculate_documentation_needs(task),
+            security_impact=self.calculate_security_impact(task)
         )
     
     def calculate_complexity_score(self, title: str, description: str) -> float:
         """Calculate complexity score based on keywords"""
-        text = (title + ' ' + description).lower()
+        text = title + ' ' + description
         
-        high_count = sum(1 for keyword in self.complexity_keywords['high'] if keyword in text)
-        medium_count = sum(1 for keyword in self.complexity_keywords['medium'] if keyword in text)
-        low_count = sum(1 for keyword in self.complexity_keywords['low'] if keyword in text)
+        # Each distinct keyword counts once, however often it appears
+        high_count, medium_count, low_count = (
+            len({match.lower() for match in self.complexity_patterns[level].findall(text)})
+            for level in ('high', 'medium', 'low')
+        )
         
         # Weighted complexity score
         complexity = (high_count * 3 + medium_count * 2 + low_count * 1) / 10
         return min(complexity, 1.0)
     
-    def estimate_duration(self, task: Dict[str, Any], historical_data: List[Dict[str, Any]] = None) -> float:
+    def estimate_duration(self, task: Dict[str, Any]) -> float:
         """Estimate task duration based on historical data"""
-        if not historical_data:
-            # Default duration estimates
-            category = task.get('category', 'unknown')
-            default_durations = {
-                'bugs': 2.0,  # hours
-                'features': 8.0,
-                'security': 4.0,
-                'maintenance': 3.0,
-                'docs': 1.0
-            }
-            return default_durations.get(category, 4.0)
-        
-        # Use historical data to estimate duration
-        similar_tasks = [
-            t for t in historical_data 
-            if t.get('category') == task.get('category')
-        ]
+        category = task.get('category', 'unknown')
         
-        if similar_tasks:
-            durations = [t.get('actual_duration', 4.0) for t in similar_tasks]
-            return np.mean(durations)
+        with self.duration_lock:
+            if not self.duration_counts:
+                # Default duration estimates
+                return self.default_durations.get(category, 4.0)
+            
+            # Use the running historical mean for the category
+            count = self.duration_counts.get(category)
+            if count:
+                return self.duration_sums[category] / count
         
         return 4.0  # Default fallback
     
@@ -191,36 +357,40 @@ class TaskFeatureExtractor:
         
         return min(max(base_priority, 0.0), 1.0)
     
-    def calculate_deadline_urgency(self, task: Dict[str, Any]) -> float:
+    def calculate_deadline_urgency(self, task: Dict[str, Any], now: Optional[datetime] = None) -> float:
         """Calculate deadline urgency"""
         deadline = task.get('deadline')
-        if not deadline:
+        if not deadline or not isinstance(deadline, str):
             return 0.0
         
         try:
             deadline_date = datetime.fromisoformat(deadline)
-            days_until_deadline = (deadline_date - datetime.now()).days
-            
-            if days_until_deadline <= 0:
-                return 1.0
-            elif days_until_deadline <= 1:
-                return 0.9
-            elif days_until_deadline <= 3:
-                return 0.7
-            elif days_until_deadline <= 7:
-                return 0.5
-            else:
-                return 0.2
-        except:
+        except ValueError:
             return 0.0
+        
+        # Offset-aware deadlines can't be compared with the naive local clock
+        if deadline_date.tzinfo is not None:
+            return 0.0
+        
+        days_until_deadline = (deadline_date - (now or datetime.now())).days
+        
+        if days_until_deadline <= 0:
+            return 1.0
+        elif days_until_deadline <= 1:
+            return 0.9
+        elif days_until_deadline <= 3:
+            return 0.7
+        elif days_until_deadline <= 7:
+            return 0.5
+        else:
+            return 0.2
     
     def calculate_resource_requirements(self, task: Dict[str, Any]) -> float:
         """Calculate resource requirements"""
         requirements = task.get('requirements', [])
         
         # Count resource-intensive requirements
-        resource_keywords = ['database', 'api', 'integration', 'performance', 'scalability']
-        resource_count = sum(1 for req in requirements if any(keyword in req.lower() for keyword in resource_keywords))
+        resource_count = sum(1 for req in requirements if self.resource_pattern.search(req))
         
         return min(resource_count / 5.0, 1.0)
     
@@ -247,15 +417,7 @@ class TaskFeatureExtractor:
         """Calculate business value"""
         # This would typically be based on business metrics
         # For now, use category-based scoring
-        category_values = {
-            'security': 0.9,
-            'features': 0.8,
-            'bugs': 0.7,
-            'maintenance': 0.5,
-            'docs': 0.3
-        }
-        
-        return category_values.get(task.get('category', 'unknown'), 0.5)
+        return self.category_values.get(task.get('category', 'unknown'), 0.5)
     
     def calculate_technical_debt(self, task: Dict[str, Any]) -> float:
         """Calculate technical debt impact"""
@@ -295,7 +457,7 @@ class TaskFeatureExtractor:
         if 'security' in task.get('title', '').lower():
             return 0.8
         
-        if 'authentication' in task.get('title', '').lower() or 'authorization' in task.get('title', '').lower():
+        if self.auth_pattern.search(task.get('title', '')):
             return 0.6
         
         return 0.1  # Default low security impact
@@ -305,79 +467,81 @@ class MLTaskPrioritizer:
     
     def __init__(self):
         self.feature_extractor = TaskFeatureExtractor()
-        self.models = {
-            'duration': RandomForestRegressor(n_estimators=100, random_state=42),
-            'success_probability': GradientBoostingRegressor(n_estimators=100, random_state=42),
-            'effort_score': LinearRegression()
-        }
-        self.scalers = {
-            'duration': StandardScaler(),
-            'success_probability': StandardScaler(),
-            'effort_score': StandardScaler()
-        }
-        self.label_encoders = {
-            'category': LabelEncoder(),
-            'agent': LabelEncoder()
-        }
-        self.historical_data = []
+        # Built on first training (or loaded); the heuristic path never needs them
+        self.models = {}
+        # One scaler, fit once, feeds every model
+        self.scaler = None
+        # Category -> integer code, in sorted order as LabelEncoder assigned them
+        self.category_codes = {}
+        self.historical_data = deque(maxlen=MAX_HISTORY)
         self.model_trained = False
+        # Serialized ONNX graphs and their inference sessions, by model name
+        self.onnx_models = {}
+        self.onnx_sessions = {}
         self.lock = threading.Lock()
     
+    @classmethod
+    def create_models(cls) -> Dict[str, Any]:
+        """Untrained estimators, by model name"""
+        return {
+            'duration': cls.create_duration_model(),
+            'success_probability': HistGradientBoostingRegressor(max_iter=200, max_depth=8, random_state=42),
+            'effort_score': LinearRegression()
+        }
+    
+    @staticmethod
+    def create_duration_model():
+        """LightGBM regressor for task duration, or a random forest without LightGBM"""
+        if lgb is not None:
+            return lgb.LGBMRegressor(n_estimators=200, num_leaves=31, n_jobs=-1,
+                                     random_state=42, verbose=-1)
+        # Depth, leaf size and row subsampling bound the size of each tree
+        return RandomForestRegressor(n_estimators=100, n_jobs=-1, max_depth=12, min_samples_leaf=5,
+                                     max_samples=0.7, random_state=42)
+    
     def add_historical_data(self, task_data: Dict[str, Any]):
         """Add historical task data for training"""
+        # The lock keeps the duration means in step with the bounded history
         with self.lock:
+            if len(self.historical_data) == self.historical_data.maxlen:
+                # The oldest entry is about to be evicted
+                evicted = self.historical_data[0]
+                self.feature_extractor.forget_duration(evicted.get('category', 'unknown'),
+                                                       evicted.get('actual_duration', 4.0))
+            
             self.historical_data.append(task_data)
+            self.feature_extractor.record_duration(task_data.get('category', 'unknown'),
+                                                   task_data.get('actual_duration', 4.0))
+    
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Consistent copy of the historical data"""
+        with self.lock:
+            return list(self.historical_data)
     
     def prepare_training_data(self) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
         """Prepare training data from historical data"""
-        if len(self.historical_data) < 10:
+        historical_data = self.snapshot()
+        if len(historical_data) < 10:
             return None, None
         
-        features_list = []
+        # Extract features for all historical tasks in one vectorized pass
+        df = self.feature_extractor.extract_features_batch(historical_data)
+        
         targets = {
-            'duration': [],
-            'success_probability': [],
-            'effort_score': []
+            'duration': [data.get('actual_duration', 4.0) for data in historical_data],
+            'success_probability': [1.0 if data.get('success', True) else 0.0 for data in historical_data],
+            'effort_score': [data.get('effort_score', 0.5) for data in historical_data]
         }
         
-        for data in self.historical_data:
-            try:
-                features = self.feature_extractor.extract_features(data, self.historical_data)
-                features_list.append(asdict(features))
-                
-                # Extract targets
-                targets['duration'].append(data.get('actual_duration', 4.0))
-                targets['success_probability'].append(1.0 if data.get('success', True) else 0.0)
-                targets['effort_score'].append(data.get('effort_score', 0.5))
-                
-            except Exception as e:
-                print(f"Error processing historical data: {e}")
-                continue
-        
-        if not features_list:
-            return None, None
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(features_list)
-        
         # Encode categorical variables
-        df['category_encoded'] = self.label_encoders['category'].fit_transform(df['category'])
+        self.category_codes = {category: code for code, category in enumerate(sorted(df['category'].unique()))}
         
         # Select features for training
-        feature_columns = [
-            'complexity_score', 'estimated_duration', 'dependencies_count',
-            'agent_experience', 'priority_score', 'deadline_urgency',
-            'resource_requirements', 'risk_score', 'business_value',
-            'technical_debt', 'test_coverage', 'documentation_needs',
-            'security_impact', 'category_encoded'
-        ]
-        
-        X = df[feature_columns].values
+        X = self.build_feature_matrix(df)
         
         # Prepare targets
-        y = {}
-        for target_name, target_values in targets.items():
-            y[target_name] = np.array(target_values)
+        y = {target_name: np.asarray(target_values, dtype=np.float32)
+             for target_name, target_values in targets.items()}
         
         return X, y
     
@@ -390,97 +554,106 @@ class MLTaskPrioritizer:
             return False
         
         try:
-            # Split data
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y['duration'], test_size=0.2, random_state=42
-            )
-            
-            # Scale features
-            X_train_scaled = self.scalers['duration'].fit_transform(X_train)
-            X_test_scaled = self.scalers['duration'].transform(X_test)
-            
-            # Train duration model
-            self.models['duration'].fit(X_train_scaled, y_train)
+            # One split and one scaler fit, shared by every model
+            train_idx, test_idx = train_test_split(np.arange(len(X)), test_size=0.2, random_state=42)
             
-            # Evaluate
-            y_pred = self.models['duration'].predict(X_test_scaled)
-            mse = mean_squared_error(y_test, y_pred)
-            r2 = r2_score(y_test, y_pred)
+            if not self.models:
+                self.models = self.create_models()
+            self.scaler = StandardScaler()
+            X_train_scaled = self.scaler.fit_transform(X[train_idx])
+            X_test_scaled = self.scaler.transform(X[test_idx])
             
-            print(f"Duration model trained - MSE: {mse:.3f}, R²: {r2:.3f}")
-            
-            # Train other models similarly
-            for model_name in ['success_probability', 'effort_score']:
+            for model_name, model in self.models.items():
                 if model_name in y and len(y[model_name]) > 0:
-                    X_train, X_test, y_train, y_test = train_test_split(
-                        X, y[model_name], test_size=0.2, random_state=42
-                    )
-                    
-                    X_train_scaled = self.scalers[model_name].fit_transform(X_train)
-                    X_test_scaled = self.scalers[model_name].transform(X_test)
-                    
-                    self.models[model_name].fit(X_train_scaled, y_train)
+                    model.fit(X_train_scaled, y[model_name][train_idx])
                     
-                    y_pred = self.models[model_name].predict(X_test_scaled)
+                    # Evaluate
+                    y_test = y[model_name][test_idx]
+                    y_pred = model.predict(X_test_scaled)
                     mse = mean_squared_error(y_test, y_pred)
                     r2 = r2_score(y_test, y_pred)
                     
                     print(f"{model_name} model trained - MSE: {mse:.3f}, R²: {r2:.3f}")
             
             self.model_trained = True
+            self.compile_onnx_models()
             return True
             
         except Exception as e:
             print(f"Error training models: {e}")
             return False
     
+    def compile_onnx_models(self):
+        """Convert the trained tree ensembles to ONNX Runtime sessions, if available"""
+        self.onnx_models = {}
+        self.onnx_sessions = {}
+        if ort is None:
+            return
+        
+        for model_name in ONNX_MODELS:
+            model = self.models[model_name]
+            # skl2onnx only converts scikit-learn estimators; LightGBM predicts natively
+            if not type(model).__module__.startswith('sklearn.'):
+                continue
+            
+            try:
+                # Only the model is converted; it takes the already-scaled matrix
+                n_features = self.scaler.n_features_in_
+                onnx_model = convert_sklearn(model, initial_types=[('X', FloatTensorType([None, n_features]))])
+                self.load_onnx_model(model_name, onnx_model.SerializeToString())
+            except Exception as e:
+                # The sklearn model keeps serving predictions; converter errors can dump whole graphs
+                print(f"Error converting {model_name} model to ONNX: {str(e).splitlines()[0]}")
+    
+    def load_onnx_model(self, model_name: str, onnx_bytes: bytes):
+        """Create an inference session for a serialized ONNX model"""
+        self.onnx_sessions[model_name] = ort.InferenceSession(onnx_bytes, providers=['CPUExecutionProvider'])
+        self.onnx_models[model_name] = onnx_bytes
+    
+    def predict_model(self, model_name: str, scaled_matrix: np.ndarray) -> np.ndarray:
+        """Predict with one model on the scaled matrix, via ONNX Runtime when compiled"""
+        session = self.onnx_sessions.get(model_name)
+        if session is not None:
+            return session.run(None, {'X': scaled_matrix.astype(np.float32, copy=False)})[0].ravel()
+        
+        return self.models[model_name].predict(scaled_matrix)
+    
     def predict_task_priorities(self, tasks: List[Dict[str, Any]]) -> List[TaskPrediction]:
         """Predict priorities for a list of tasks"""
         if not self.model_trained:
             print("Models not trained, using heuristic prioritization")
             return self.heuristic_prioritization(tasks)
         
+        if not tasks:
+            return []
+        
+        # Extract features for the whole batch up front
+        features_df = self.feature_extractor.extract_features_batch(tasks)
+        
+        try:
+            # Scale once, then one predict call per model over every task
+            scaled = self.scaler.transform(self.build_feature_matrix(features_df))
+            predicted_durations = self.predict_model('duration', scaled)
+            
+            predicted_success_probs = self.predict_model(
+                'success_probability', scaled
+            ) if 'success_probability' in self.models else np.full(len(tasks), 0.8)
+            
+            predicted_efforts = self.predict_model(
+                'effort_score', scaled
+            ) if 'effort_score' in self.models else np.full(len(tasks), 0.5)
+        except Exception as e:
+            print(f"Error predicting task batch: {e}")
+            # Fallback to heuristic
+            return self.heuristic_prioritization(tasks)
+        
         predictions = []
         
-        for task in tasks:
+        # tolist() yields Python floats; float32 model outputs would not JSON-serialize
+        for task, features, predicted_duration, predicted_success_prob, predicted_effort in zip(
+                tasks, self.feature_extractor.iter_task_features(features_df),
+                predicted_durations.tolist(), predicted_success_probs.tolist(), predicted_efforts.tolist()):
             try:
-                # Extract features
-                features = self.feature_extractor.extract_features(task, self.historical_data)
-                feature_dict = asdict(features)
-                
-                # Prepare feature vector
-                feature_columns = [
-                    'complexity_score', 'estimated_duration', 'dependencies_count',
-                    'agent_experience', 'priority_score', 'deadline_urgency',
-                    'resource_requirements', 'risk_score', 'business_value',
-                    'technical_debt', 'test_coverage', 'documentation_needs',
-                    'security_impact'
-                ]
-                
-                feature_vector = [feature_dict[col] for col in feature_columns]
-                
-                # Add category encoding
-                try:
-                    category_encoded = self.label_encoders['category'].transform([features.category])[0]
-                    feature_vector.append(category_encoded)
-                except:
-                    feature_vector.append(0)  # Default encoding
-                
-                feature_vector = np.array(feature_vector).reshape(1, -1)
-                
-                # Make predictions
-                predicted_duration = self.models['duration'].predict(
-                    self.scalers['duration'].transform(feature_vector)
-                )[0]
-                
-                predicted_success_prob = self.models['success_probability'].predict(
-                    self.scalers['success_probability'].transform(feature_vector)
-                )[0] if 'success_probability' in self.models else 0.8
-                
-                predicted_effort = self.models['effort_score'].predict(
-                    self.scalers['effort_score'].transform(feature_vector)
-                )[0] if 'effort_score' in self.models else 0.5
-                
                 # Determine recommended agent
                 recommended_agent = self.recommend_agent(task, features)
                 
@@ -514,19 +687,72 @@ class MLTaskPrioritizer:
         
         return predictions
     
+    def build_feature_matrix(self, features_df: pd.DataFrame) -> np.ndarray:
+        """Stack the model inputs for every task into one (n_tasks, n_features) array"""
+        # Fill the matrix column by column; no intermediate frame or per-row objects
+        # float32 throughout: features are small bounded values and trees split on float32 anyway
+        feature_matrix = np.empty((len(features_df), len(FEATURE_COLUMNS) + 1), dtype=np.float32)
+        for i, column in enumerate(FEATURE_COLUMNS):
+            feature_matrix[:, i] = features_df[column].to_numpy()
+        
+        # Categories unseen during training get the default encoding 0
+        feature_matrix[:, -1] = features_df['category'].map(self.category_codes).fillna(0).to_numpy()
+        
+        return feature_matrix
+    
     def heuristic_prioritization(self, tasks: List[Dict[str, Any]]) -> List[TaskPrediction]:
         """Fallback heuristic prioritization when ML models are not available"""
-        predictions = []
-        
-        for task in tasks:
-            prediction = self.create_heuristic_prediction(task)
-            predictions.append(prediction)
+        if not tasks:
+            return []
+        
+        # Same rules as create_heuristic_prediction, evaluated column-wise over the batch
+        features_df = self.feature_extractor.extract_features_batch(tasks)
+        complexity = features_df['complexity_score'].to_numpy()
+        resources = features_df['resource_requirements'].to_numpy()
+        urgency = features_df['deadline_urgency'].to_numpy()
+        risk = features_df['risk_score'].to_numpy()
+        category = features_df['category']
+        mentions_test = pd.Series([task.get('title', '') for task in tasks]).astype(str).str.lower().str.contains(
+            'test', regex=False).to_numpy()
+        
+        predicted_success_probs = 0.8 - risk * 0.3
+        predicted_efforts = complexity * resources
+        
+        recommended_agents = np.select(
+            [category.eq('security').to_numpy() | (features_df['security_impact'].to_numpy() > 0.7),
+             category.eq('docs').to_numpy() | (features_df['documentation_needs'].to_numpy() > 0.7),
+             (features_df['test_coverage'].to_numpy() > 0.7) | mentions_test],
+            ['security', 'docs', 'tester'], default='engineer'
+        )
         
-        return predictions
+        schedule_times = np.select([urgency > 0.8, urgency > 0.5, complexity > 0.7],
+                                   ['immediate', 'today', 'this_week'], default='next_week')
+        
+        risk_masks = [risk > 0.7, complexity > 0.8, features_df['dependencies_count'].to_numpy() > 3,
+                      urgency > 0.9, resources > 0.8]
+        risk_factor_lists = [list(compress(RISK_FACTORS, row)) for row in zip(*risk_masks)]
+        
+        return [
+            TaskPrediction(
+                task_id=task['id'],
+                predicted_duration=predicted_duration,
+                predicted_success_probability=predicted_success_prob,
+                predicted_effort_score=predicted_effort,
+                recommended_agent=recommended_agent,
+                optimal_schedule_time=optimal_schedule_time,
+                confidence_score=0.6,  # Lower confidence for heuristic
+                risk_factors=risk_factors
+            )
+            for task, predicted_duration, predicted_success_prob, predicted_effort,
+                recommended_agent, optimal_schedule_time, risk_factors in zip(
+                tasks, features_df['estimated_duration'].tolist(), predicted_success_probs.tolist(),
+                predicted_efforts.tolist(), recommended_agents.tolist(), schedule_times.tolist(),
+                risk_factor_lists)
+        ]
     
-    def create_heuristic_prediction(self, task: Dict[str, Any]) -> TaskPrediction:
+    def create_heuristic_prediction(self, task: Dict[str, Any], now: Optional[datetime] = None) -> TaskPrediction:
         """Create heuristic prediction for a task"""
-        features = self.feature_extractor.extract_features(task, self.historical_data)
+        features = self.feature_extractor.extract_features(task, now)
         
         # Simple heuristic calculations
         predicted_duration = features.estimated_duration
@@ -627,29 +853,72 @@ class MLTaskPrioritizer:
         try:
             model_data = {
                 'models': self.models,
-                'scalers': self.scalers,
-                'label_encoders': self.label_encoders,
-                'model_trained': self.model_trained
+                'scaler': self.scaler,
+                'category_codes': self.category_codes,
+                'model_trained': self.model_trained,
+                # The .onnx graphs saved below take scaled input
+                'onnx_input': 'scaled'
             }
             
-            joblib.dump(model_data, filepath)
+            # Compressed rather than memory-mapped: joblib can't mmap compressed pickles,
+            # and the forest arrays shrink several-fold on disk
+            joblib.dump(model_data, filepath, compress=MODEL_COMPRESSION, protocol=5)
+            
+            # ONNX graphs sit next to the pickle, e.g. task_prioritizer.duration.onnx
+            for model_name, onnx_bytes in self.onnx_models.items():
+                with open(self.onnx_model_path(filepath, model_name), 'wb') as f:
+                    f.write(onnx_bytes)
+            
             print(f"Models saved to {filepath}")
             return True
         except Exception as e:
             print(f"Error saving models: {e}")
             return False
     
+    @staticmethod
+    def onnx_model_path(filepath: str, model_name: str) -> str:
+        """Path of a model's ONNX graph alongside the saved pickle"""
+        return f"{os.path.splitext(filepath)[0]}.{model_name}.onnx"
+    
     def load_models(self, filepath: str):
         """Load trained models from disk"""
         try:
             if os.path.exists(filepath):
                 model_data = joblib.load(filepath)
                 
-                self.models = model_data['models']
-                self.scalers = model_data['scalers']
-                self.label_encoders = model_data['label_encoders']
+                if 'scaler' in model_data:
+                    self.models = model_data['models']
+                    self.scaler = model_data['scaler']
+                elif 'pipelines' in model_data:
+                    # Saves from the scaler -> model Pipeline layout
+                    pipelines = model_data['pipelines']
+                    self.models = {model_name: pipeline.named_steps['model']
+                                   for model_name, pipeline in pipelines.items()}
+                    self.scaler = pipelines['duration'].named_steps['scale']
+                else:
+                    # Older saves kept a scaler per model, each fit on the same training split
+                    self.models = model_data['models']
+                    self.scaler = model_data['scalers']['duration']
+                
+                if 'category_codes' in model_data:
+                    self.category_codes = model_data['category_codes']
+                else:
+                    # Models saved before category_codes carry a fitted LabelEncoder
+                    classes = model_data['label_encoders']['category'].classes_
+                    self.category_codes = {category: code for code, category in enumerate(classes)}
                 self.model_trained = model_data['model_trained']
                 
+                self.onnx_models = {}
+                self.onnx_sessions = {}
+                # Only graphs saved with onnx_input 'scaled' match predict_model's input;
+                # earlier pickles sit next to whole-pipeline graphs, which are not reused
+                if ort is not None and model_data.get('onnx_input') == 'scaled':
+                    for model_name in ONNX_MODELS:
+                        onnx_path = self.onnx_model_path(filepath, model_name)
+                        if os.path.exists(onnx_path):
+                            with open(onnx_path, 'rb') as f:
+                                self.load_onnx_model(model_name, f.read())
+                
                 print(f"Models loaded from {filepath}")
                 return True
         except Exception as e:
@@ -657,6 +926,17 @@ class MLTaskPrioritizer:
         
         return False
 
+@lru_cache(maxsize=1)
+def get_prioritizer(model_path: str = MODEL_PATH) -> MLTaskPrioritizer:
+    """Shared prioritizer for library callers, loading saved models on first use"""
+    prioritizer = MLTaskPrioritizer()
+    prioritizer.load_models(model_path)
+    return prioritizer
+
+def prioritize(tasks: List[Dict[str, Any]]) -> List[TaskPrediction]:
+    """Predict priorities for tasks with the shared prioritizer"""
+    return get_prioritizer().predict_task_priorities(tasks)
+
 def main():
     """Main ML prioritization system function"""
     print("Machine Learning Task Prioritization System starting...")
@@ -665,7 +945,7 @@ def main():
     prioritizer = MLTaskPrioritizer()
     
     # Load existing models if available
-    model_path = "ml_models/task_prioritizer.pkl"
+    model_path = MODEL_PATH
     os.makedirs(os.path.dirname(model_path), exist_ok=True)
     
     if prioritizer.load_models(model_path):
@@ -673,33 +953,25 @@ def main():
     else:
         print("No pre-trained models found, will use heuristic prioritization")
     
-    # Add some sample historical data for demonstration
-    sample_historical_data = [
-        {
-            'id': 'task_1',
-            'category': 'bugs',
-            'title': 'Fix login bug',
-            'actual_duration': 2.0,
-            'success': True,
-            'effort_score': 0.3
-        },
-        {
-            'id': 'task_2',
-            'category': 'features',
-            'title': 'Add user dashboard',
-            'actual_duration': 8.0,
-            'success': True,
-            'effort_score': 0.7
-        },
-        {
-            'id': 'task_3',
-            'category': 'security',
-            'title': 'Implement OAuth',
-            'actual_duration': 6.0,
-            'success': True,
-            'effort_score': 0.8
-        }
+    # Synthesize enough sample history for the demo to actually train the models
+    sample_templates = [
+        ('bugs', 'Fix login bug', 2.0, 0.3),
+        ('features', 'Add user dashboard', 8.0, 0.7),
+        ('security', 'Implement OAuth', 6.0, 0.8),
+        ('docs', 'Document API endpoints', 3.0, 0.4),
+        ('maintenance', 'Refactor state management', 5.0, 0.6)
     ]
+    sample_historical_data = []
+    for i in range(50):
+        category, title, duration, effort_score = sample_templates[i % len(sample_templates)]
+        sample_historical_data.append({
+            'id': f'task_{i + 1}',
+            'category': category,
+            'title': title,
+            'actual_duration': duration * (0.8 + (i % 5) * 0.1),
+            'success': i % 7 != 0,
+            'effort_score': effort_score
+        })
     
     for data in sample_historical_data:
         prioritizer.add_historical_data(data)
@@ -752,14 +1024,6 @@ def main():
         print(f"  Risk Factors: {', '.join(prediction.risk_factors)}")
     
     print("\n✓ ML Task Prioritization System is ready")
-    
-    # Keep the system running
-    try:
-        while True:
-            time.sleep(60)
-            print(f"ML Prioritization System status: {len(prioritizer.historical_data)} historical tasks")
-    except KeyboardInterrupt:
-        print("Shutting down ML prioritization system...")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -6,20 +6,91 @@ Enables cross-repository operations and coordination for the multi-agent workfor
 
 import os
 import sys
-import json
-import subprocess
-from datetime import datetime, timedelta
+import base64
+import asyncio
+import tempfile
+from types import MappingProxyType
+from collections import Counter, defaultdict, deque
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field, replace
 import threading
 import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urlparse
 
+try:
+    # Optional: HTTP/2 client, so concurrent GitHub calls share one multiplexed connection
+    import httpx
+    import h2  # noqa: F401  (required by httpx for http2=True)
+except ImportError:
+    httpx = None
+
+from _cache import CACHE_DIR
+from _serialize import dumps_bytes, loads
+from _log import setup_queue_logging
+from _timestamps import now_iso
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Repository validations sharing no token run concurrently, up to this many at a time
+VALIDATION_WORKERS = 16
+
+# Syncs run concurrently, up to this many at a time
+SYNC_WORKERS = int(os.getenv('SYNC_WORKERS', '8'))
+
+GITHUB_HEADERS = {
+    'Accept': 'application/vnd.github.v3+json',
+    'User-Agent': 'linguamate-multi-repo-agent'
+}
+
+def create_github_session() -> Any:
+    """Pooled HTTP client for the GitHub API: httpx over HTTP/2 if available, else requests"""
+    if httpx is not None:
+        # One connection carries every concurrent request as a separate stream;
+        # httpx.Client is thread-safe, so the validation and sync pools share it
+        transport = httpx.HTTPTransport(
+            http2=True,
+            retries=3,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+        )
+        return httpx.Client(transport=transport, headers=GITHUB_HEADERS, timeout=10.0)
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    )
+    session.mount('https://', adapter)
+    session.headers.update(GITHUB_HEADERS)
+    return session
+
+def parse_github_url(url: str) -> Tuple[str, str]:
+    """Extract (owner, name) from a GitHub repository URL; ValueError if unsupported"""
+    parsed_url = urlparse(url)
+    if 'github.com' not in parsed_url.netloc:
+        raise ValueError(f"Only GitHub repositories are currently supported: {url}")
+    
+    path_parts = parsed_url.path.strip('/').split('/')
+    if len(path_parts) < 2:
+        raise ValueError(f"Invalid repository URL format: {url}")
+    
+    return path_parts[0], path_parts[1]
+
 # Add mcp_servers to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'mcp_servers'))
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+# ETags of validated repositories, kept across runs so cold starts can revalidate with a 304
+ETAG_CACHE_PATH = os.path.join(CACHE_DIR, 'repo_etags.json')
+
+@dataclass(slots=True, frozen=True)
 class Repository:
     """Represents a repository configuration"""
     repo_id: str
@@ -33,8 +104,13 @@ class Repository:
     priority: int
     last_sync: str
     status: str  # 'active', 'inactive', 'error'
+    owner_name: Tuple[str, str] = field(init=False)  # (owner, name) parsed from url
+    
+    def __post_init__(self):
+        """Parse the URL once; unsupported or malformed URLs are rejected here"""
+        object.__setattr__(self, 'owner_name', parse_github_url(self.url))
 
-@dataclass
+@dataclass(slots=True)
 class CrossRepoTask:
     """Represents a task that spans multiple repositories"""
     task_id: str
@@ -47,7 +123,7 @@ class CrossRepoTask:
     updated_at: str
     assigned_agents: Dict[str, str]  # repo_id -> agent_role
 
-@dataclass
+@dataclass(slots=True)
 class RepositorySync:
     """Represents synchronization between repositories"""
     sync_id: str
@@ -62,95 +138,244 @@ class RepositoryManager:
     """Manages multiple repositories and their configurations"""
     
     def __init__(self):
-        self.repositories = {}
+        # Read-only view, replaced wholesale under self.lock on every add/remove;
+        # readers use whichever snapshot is current and never take the lock
+        self.repositories = MappingProxyType({})
         self.cross_repo_tasks = {}
         self.sync_status = {}
+        # Repositories per status, kept current on every change so status reports need no scan
+        self.repo_status_counts = Counter()
+        # One pooled client, so repeated API calls reuse the TLS connection
+        self.session = create_github_session()
+        # API URL -> (ETag, repository JSON); validations update it concurrently
+        self.etag_cache = self.load_etag_cache()
+        self.etag_lock = threading.Lock()
+        # Access token -> (requests remaining, reset epoch seconds) from GitHub's X-RateLimit headers
+        self.rate_limits = {}
         self.lock = threading.Lock()
     
     def add_repository(self, repo: Repository) -> bool:
         """Add a new repository to the system"""
+        try:
+            # Validate repository access; the network call runs without holding the lock
+            if not self.validate_repository_access(repo):
+                return False
+            
+            self.register_repositories([repo])
+            return True
+        except Exception as e:
+            logger.error(f"✗ Error adding repository {repo.name}: {e}")
+            return False
+    
+    def add_repositories(self, repos: List[Repository]) -> Dict[str, bool]:
+        """Add many repositories, validating them in bulk; returns repo_id -> added"""
+        results = self.validate_repositories_bulk(repos)
+        self.register_repositories([repo for repo in repos if results[repo.repo_id]])
+        return results
+    
+    def register_repositories(self, repos: List[Repository]):
+        """Record already validated repositories and publish a new snapshot"""
         with self.lock:
-            try:
-                # Validate repository access
-                if not self.validate_repository_access(repo):
-                    return False
-                
-                self.repositories[repo.repo_id] = repo
+            repositories = dict(self.repositories)
+            for repo in repos:
+                previous = repositories.get(repo.repo_id)
+                if previous is not None:
+                    self.repo_status_counts[previous.status] -= 1
+                repositories[repo.repo_id] = repo
+                self.repo_status_counts[repo.status] += 1
                 self.sync_status[repo.repo_id] = {
-                    'last_sync': datetime.now().isoformat(),
+                    'last_sync': now_iso(),
                     'status': 'active',
                     'sync_count': 0
                 }
                 
-                print(f"✓ Repository {repo.name} added successfully")
-                return True
-            except Exception as e:
-                print(f"✗ Error adding repository {repo.name}: {e}")
-                return False
+                logger.info(f"✓ Repository {repo.name} added successfully")
+            self.repositories = MappingProxyType(repositories)
+    
+    def validate_repositories_bulk(self, repos: List[Repository]) -> Dict[str, bool]:
+        """Validate many repositories with one GraphQL query per access token"""
+        results = {}
+        by_token = {}
+        for repo in repos:
+            by_token.setdefault(repo.access_token, []).append(repo)
+        
+        # Each token is its own rate-limit bucket, so token groups are validated concurrently
+        with ThreadPoolExecutor(max_workers=VALIDATION_WORKERS) as pool:
+            futures = [pool.submit(self.validate_token_group, token, token_repos)
+                       for token, token_repos in by_token.items()]
+            for future in as_completed(futures):
+                results.update(future.result())
+        
+        return results
+    
+    def validate_token_group(self, token: str, token_repos: List[Repository]) -> Dict[str, bool]:
+        """Validate the repositories that share one access token"""
+        if len(token_repos) == 1:
+            # A lone repository costs one request either way; use the REST check
+            repo = token_repos[0]
+            return {repo.repo_id: self.validate_repository_access(repo)}
+        return self.query_repositories(token, token_repos)
+    
+    def record_rate_limit(self, token: str, response: Any):
+        """Remember how much of a token's rate limit the last response said was left"""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining is not None:
+            self.rate_limits[token] = (int(remaining), int(response.headers.get('X-RateLimit-Reset', 0)))
+    
+    def rate_limit_exhausted(self, token: str) -> bool:
+        """Whether a token has no requests left until its rate-limit window resets"""
+        remaining, reset_at = self.rate_limits.get(token, (1, 0))
+        return remaining <= 0 and time.time() < reset_at
+    
+    def query_repositories(self, token: str, token_repos: List[Repository]) -> Dict[str, bool]:
+        """Check that repositories sharing a token exist, in one GraphQL round trip"""
+        # One aliased repository() field per repo; owner/name go in as variables, never inlined
+        variables = {}
+        params = []
+        fields = []
+        for i, repo in enumerate(token_repos):
+            owner, repo_name = repo.owner_name
+            variables[f'o{i}'] = owner
+            variables[f'n{i}'] = repo_name
+            params.append(f'$o{i}: String!, $n{i}: String!')
+            fields.append(f'r{i}: repository(owner: $o{i}, name: $n{i}) {{ nameWithOwner }}')
+        query = f"query({', '.join(params)}) {{ {' '.join(fields)} }}"
+        
+        if self.rate_limit_exhausted(token):
+            logger.warning(f"✗ Rate limit exhausted; skipping validation of {len(token_repos)} repositories")
+            return {repo.repo_id: False for repo in token_repos}
+        
+        try:
+            response = self.session.post(
+                GITHUB_GRAPHQL_URL,
+                json={'query': query, 'variables': variables},
+                headers={'Authorization': f'bearer {token}'},
+                timeout=10
+            )
+            self.record_rate_limit(token, response)
+            
+            if response.status_code != 200:
+                logger.error(f"✗ Bulk repository validation failed: {response.status_code}")
+                return {repo.repo_id: False for repo in token_repos}
+            
+            # Missing or inaccessible repositories come back as null with a NOT_FOUND error
+            data = loads(response.content).get('data') or {}
+        except Exception as e:
+            logger.error(f"✗ Error validating repositories: {e}")
+            return {repo.repo_id: False for repo in token_repos}
+        
+        results = {}
+        for i, repo in enumerate(token_repos):
+            results[repo.repo_id] = data.get(f'r{i}') is not None
+            if results[repo.repo_id]:
+                logger.info(f"✓ Repository {repo.name} is accessible")
+            else:
+                logger.error(f"✗ Repository {repo.name} is not accessible")
+        return results
     
     def validate_repository_access(self, repo: Repository) -> bool:
         """Validate that the repository is accessible"""
+        if self.fetch_repository_data(repo) is None:
+            return False
+        
+        logger.info(f"✓ Repository {repo.name} is accessible")
+        return True
+    
+    def fetch_repository_data(self, repo: Repository) -> Optional[Dict[str, Any]]:
+        """Fetch a repository's GitHub metadata, or None if it is not accessible"""
         try:
-            # Parse GitHub URL
-            parsed_url = urlparse(repo.url)
-            if 'github.com' not in parsed_url.netloc:
-                print(f"Only GitHub repositories are currently supported")
-                return False
+            owner, repo_name = repo.owner_name
             
-            # Extract owner and repo name
-            path_parts = parsed_url.path.strip('/').split('/')
-            if len(path_parts) < 2:
-                print(f"Invalid repository URL format")
-                return False
-            
-            owner, repo_name = path_parts[0], path_parts[1]
+            if self.rate_limit_exhausted(repo.access_token):
+                logger.warning(f"✗ Rate limit exhausted; skipping request for {repo.name}")
+                return None
             
             # Test API access
             api_url = f"https://api.github.com/repos/{owner}/{repo_name}"
-            headers = {
-                'Authorization': f'token {repo.access_token}',
-                'Accept': 'application/vnd.github.v3+json'
-            }
+            headers = {'Authorization': f'token {repo.access_token}'}
             
-            response = requests.get(api_url, headers=headers, timeout=10)
+            # Conditional request: an unchanged repository answers 304, which is free against the rate limit
+            cached = self.etag_cache.get(api_url)
+            if cached:
+                headers['If-None-Match'] = cached[0]
             
-            if response.status_code == 200:
-                repo_data = response.json()
-                print(f"✓ Repository {repo.name} is accessible")
-                return True
+            response = self.session.get(api_url, headers=headers, timeout=10)
+            self.record_rate_limit(repo.access_token, response)
+            
+            if response.status_code == 304 and cached:
+                logger.debug(f"Repository {repo.name} unchanged since last request")
+                return cached[1]
+            elif response.status_code == 200:
+                repo_data = loads(response.content)
+                etag = response.headers.get('ETag')
+                if etag:
+                    with self.etag_lock:
+                        self.etag_cache[api_url] = (etag, repo_data)
+                    self.save_etag_cache()
+                return repo_data
             else:
-                print(f"✗ Repository {repo.name} access failed: {response.status_code}")
-                return False
+                logger.error(f"✗ Repository {repo.name} access failed: {response.status_code}")
+                return None
                 
         except Exception as e:
-            print(f"✗ Error validating repository {repo.name}: {e}")
-            return False
+            logger.error(f"✗ Error fetching repository {repo.name}: {e}")
+            return None
+    
+    @staticmethod
+    def load_etag_cache() -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """Load ETags saved by earlier runs; a missing or unreadable file means an empty cache"""
+        try:
+            with open(ETAG_CACHE_PATH, 'rb') as f:
+                return {api_url: tuple(entry) for api_url, entry in loads(f.read()).items()}
+        except (OSError, ValueError, TypeError, AttributeError):
+            return {}
+    
+    def save_etag_cache(self):
+        """Write the ETag cache to disk, replacing the previous file atomically"""
+        # Serialize under the lock, write outside it, so concurrent validations never wait on disk
+        with self.etag_lock:
+            payload = dumps_bytes(self.etag_cache)
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            temp_path = f"{ETAG_CACHE_PATH}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(temp_path, ETAG_CACHE_PATH)
+        except OSError:
+            # The cache is an optimization; failing to persist it must never fail validation
+            pass
     
     def get_repository(self, repo_id: str) -> Optional[Repository]:
         """Get repository by ID"""
-        with self.lock:
-            return self.repositories.get(repo_id)
+        return self.repositories.get(repo_id)
     
     def list_repositories(self) -> List[Repository]:
         """List all repositories"""
-        with self.lock:
-            return list(self.repositories.values())
+        return list(self.repositories.values())
     
     def update_repository_status(self, repo_id: str, status: str):
         """Update repository status"""
         with self.lock:
             if repo_id in self.repositories:
-                self.repositories[repo_id].status = status
-                self.repositories[repo_id].last_sync = datetime.now().isoformat()
+                self.repo_status_counts[self.repositories[repo_id].status] -= 1
+                self.repo_status_counts[status] += 1
+                # Repositories are immutable; publish an updated copy in a new snapshot
+                repositories = dict(self.repositories)
+                repositories[repo_id] = replace(repositories[repo_id], status=status,
+                                                last_sync=now_iso())
+                self.repositories = MappingProxyType(repositories)
     
     def remove_repository(self, repo_id: str) -> bool:
         """Remove a repository from the system"""
         with self.lock:
             if repo_id in self.repositories:
-                del self.repositories[repo_id]
+                self.repo_status_counts[self.repositories[repo_id].status] -= 1
+                repositories = dict(self.repositories)
+                del repositories[repo_id]
+                self.repositories = MappingProxyType(repositories)
                 if repo_id in self.sync_status:
                     del self.sync_status[repo_id]
-                print(f"✓ Repository {repo_id} removed")
+                logger.info(f"✓ Repository {repo_id} removed")
                 return True
             return False
 
@@ -161,7 +386,19 @@ class CrossRepositoryCoordinator:
         self.repo_manager = repo_manager
         self.cross_repo_tasks = {}
         self.task_dependencies = {}
+        # Readiness is maintained incrementally as dependency statuses change:
+        # task -> dependencies not yet completed, dependency -> tasks waiting on it,
+        # and the tasks with nothing outstanding (a dict, to keep creation order)
+        self.unmet_dependencies = {}
+        self.dependents = defaultdict(set)
+        self.ready_task_ids = {}
+        # Agent role -> ids of tasks it is assigned to on some repository (dicts, as ordered sets)
+        self.agent_tasks = defaultdict(dict)
+        # Tasks per status, kept current on every change so status reports need no scan
+        self.task_status_counts = Counter()
         self.lock = threading.Lock()
+        # Signalled on every change that can make a task available, so agents wait instead of polling
+        self.task_changed = threading.Condition(self.lock)
     
     def create_cross_repo_task(self, task: CrossRepoTask) -> bool:
         """Create a cross-repository task"""
@@ -170,25 +407,70 @@ class CrossRepositoryCoordinator:
                 # Validate repositories
                 for repo_id in task.repositories:
                     if repo_id not in self.repo_manager.repositories:
-                        print(f"✗ Repository {repo_id} not found")
+                        logger.error(f"✗ Repository {repo_id} not found")
                         return False
                 
                 # Validate dependencies
                 for dep_id in task.dependencies:
                     if dep_id not in self.cross_repo_tasks:
-                        print(f"✗ Dependency {dep_id} not found")
+                        logger.error(f"✗ Dependency {dep_id} not found")
                         return False
                 
+                previous = self.cross_repo_tasks.get(task.task_id)
+                if previous is not None:
+                    self.unindex_task(previous)
                 self.cross_repo_tasks[task.task_id] = task
                 self.task_dependencies[task.task_id] = task.dependencies
+                self.task_status_counts[task.status] += 1
+                
+                unmet = {dep_id for dep_id in task.dependencies
+                         if self.cross_repo_tasks[dep_id].status != 'completed'}
+                self.unmet_dependencies[task.task_id] = unmet
+                for dep_id in task.dependencies:
+                    self.dependents[dep_id].add(task.task_id)
+                if not unmet:
+                    self.ready_task_ids[task.task_id] = True
+                for agent_role in set(task.assigned_agents.values()):
+                    self.agent_tasks[agent_role][task.task_id] = True
                 
-                print(f"✓ Cross-repo task {task.task_id} created")
+                # Tasks waiting on a replaced task see the new version's status
+                if previous is not None and (previous.status == 'completed') != (task.status == 'completed'):
+                    self.propagate_completion(task.task_id, task.status == 'completed')
+                
+                self.task_changed.notify_all()
+                logger.info(f"✓ Cross-repo task {task.task_id} created")
                 return True
                 
             except Exception as e:
-                print(f"✗ Error creating cross-repo task: {e}")
+                logger.error(f"✗ Error creating cross-repo task: {e}")
                 return False
     
+    def unindex_task(self, task: CrossRepoTask):
+        """Drop a task's dependency edges and index entries before it is replaced; caller holds the lock"""
+        self.task_status_counts[task.status] -= 1
+        for dep_id in task.dependencies:
+            waiting = self.dependents.get(dep_id)
+            if waiting is not None:
+                waiting.discard(task.task_id)
+                if not waiting:
+                    del self.dependents[dep_id]
+        for agent_role in set(task.assigned_agents.values()):
+            self.agent_tasks[agent_role].pop(task.task_id, None)
+        self.unmet_dependencies.pop(task.task_id, None)
+        self.ready_task_ids.pop(task.task_id, None)
+    
+    def propagate_completion(self, task_id: str, completed: bool):
+        """Update readiness of the tasks waiting on a task entering or leaving 'completed'; caller holds the lock"""
+        for dependent_id in self.dependents.get(task_id, ()):
+            unmet = self.unmet_dependencies[dependent_id]
+            if completed:
+                unmet.discard(task_id)
+                if not unmet:
+                    self.ready_task_ids[dependent_id] = True
+            else:
+                unmet.add(task_id)
+                self.ready_task_ids.pop(dependent_id, None)
+    
     def assign_agents_to_repositories(self, task_id: str, assignments: Dict[str, str]) -> bool:
         """Assign agents to specific repositories for a task"""
         with self.lock:
@@ -200,13 +482,22 @@ class CrossRepositoryCoordinator:
             # Validate assignments
             for repo_id, agent_role in assignments.items():
                 if repo_id not in task.repositories:
-                    print(f"✗ Repository {repo_id} not in task {task_id}")
+                    logger.error(f"✗ Repository {repo_id} not in task {task_id}")
                     return False
             
+            previous_roles = set(task.assigned_agents.values())
             task.assigned_agents.update(assignments)
-            task.updated_at = datetime.now().isoformat()
+            task.updated_at = now_iso()
+            
+            # Reassigning a repository can leave a previous role with no part in the task
+            current_roles = set(task.assigned_agents.values())
+            for agent_role in previous_roles - current_roles:
+                self.agent_tasks[agent_role].pop(task_id, None)
+            for agent_role in current_roles:
+                self.agent_tasks[agent_role][task_id] = True
             
-            print(f"✓ Agents assigned to task {task_id}")
+            self.task_changed.notify_all()
+            logger.info(f"✓ Agents assigned to task {task_id}")
             return True
     
     def get_task_dependencies_status(self, task_id: str) -> Dict[str, str]:
@@ -227,16 +518,8 @@ class CrossRepositoryCoordinator:
     
     def can_start_task(self, task_id: str) -> bool:
         """Check if a task can be started (all dependencies completed)"""
-        if task_id not in self.task_dependencies:
-            return True  # No dependencies
-        
-        dependencies_status = self.get_task_dependencies_status(task_id)
-        
-        for dep_id, status in dependencies_status.items():
-            if status != 'completed':
-                return False
-        
-        return True
+        # Unknown tasks have no dependencies
+        return not self.unmet_dependencies.get(task_id)
     
     def update_task_status(self, task_id: str, status: str) -> bool:
         """Update task status"""
@@ -245,36 +528,61 @@ class CrossRepositoryCoordinator:
                 return False
             
             task = self.cross_repo_tasks[task_id]
+            previous_status = task.status
             task.status = status
-            task.updated_at = datetime.now().isoformat()
+            self.task_status_counts[previous_status] -= 1
+            self.task_status_counts[status] += 1
+            task.updated_at = now_iso()
             
-            print(f"✓ Task {task_id} status updated to {status}")
+            # Only transitions into or out of 'completed' change what dependents wait on
+            if (previous_status == 'completed') != (status == 'completed'):
+                self.propagate_completion(task_id, status == 'completed')
+            
+            self.task_changed.notify_all()
+            logger.info(f"✓ Task {task_id} status updated to {status}")
             return True
     
+    def get_ready_tasks_for_role(self, agent_role: str) -> List[CrossRepoTask]:
+        """Get ready tasks that have an agent of this role assigned"""
+        with self.lock:
+            return self.collect_ready_tasks_for_role(agent_role)
+    
+    def wait_for_ready_tasks(self, agent_role: str, timeout: float = 60.0) -> List[CrossRepoTask]:
+        """Block until a task is ready for this role or the timeout passes; empty list on timeout"""
+        with self.task_changed:
+            return self.task_changed.wait_for(lambda: self.collect_ready_tasks_for_role(agent_role), timeout)
+    
+    def collect_ready_tasks_for_role(self, agent_role: str) -> List[CrossRepoTask]:
+        """Ready tasks for a role; caller holds the lock"""
+        return [self.cross_repo_tasks[task_id] for task_id in self.agent_tasks.get(agent_role, ())
+                if task_id in self.ready_task_ids and self.cross_repo_tasks[task_id].status == 'pending']
+    
     def get_ready_tasks(self) -> List[CrossRepoTask]:
         """Get tasks that are ready to start"""
-        ready_tasks = []
-        
-        for task_id, task in self.cross_repo_tasks.items():
-            if task.status == 'pending' and self.can_start_task(task_id):
-                ready_tasks.append(task)
-        
-        return ready_tasks
+        with self.lock:
+            return [self.cross_repo_tasks[task_id] for task_id in self.ready_task_ids
+                    if self.cross_repo_tasks[task_id].status == 'pending']
 
 class RepositorySynchronizer:
     """Handles synchronization between repositories"""
     
-    def __init__(self, repo_manager: RepositoryManager):
+    def __init__(self, repo_manager: RepositoryManager, session: Any = None):
         self.repo_manager = repo_manager
-        self.sync_queue = []
-        self.sync_history = []
+        # GitHub calls made while syncing share the manager's connection pool
+        self.session = session or repo_manager.session
+        self.sync_queue = deque()
+        # Keep only the last 100 sync records
+        self.sync_history = deque(maxlen=100)
+        # (source, target, sync type) -> source pushed_at as of the last successful sync
+        self.synced_pushed_at = {}
+        self.pool = ThreadPoolExecutor(max_workers=SYNC_WORKERS, thread_name_prefix='repo-sync')
         self.lock = threading.Lock()
     
     def schedule_sync(self, sync: RepositorySync):
         """Schedule a synchronization between repositories"""
         with self.lock:
             self.sync_queue.append(sync)
-            print(f"✓ Sync scheduled: {sync.source_repo} -> {sync.target_repo}")
+        logger.info(f"✓ Sync scheduled: {sync.source_repo} -> {sync.target_repo}")
     
     def execute_sync(self, sync: RepositorySync) -> bool:
         """Execute synchronization between repositories"""
@@ -283,24 +591,39 @@ class RepositorySynchronizer:
             target_repo = self.repo_manager.get_repository(sync.target_repo)
             
             if not source_repo or not target_repo:
-                print(f"✗ Source or target repository not found")
+                logger.error(f"✗ Source or target repository not found")
                 return False
             
+            # Skip the sync when nothing was pushed to the source since the last one;
+            # the metadata request is ETag-conditional, so an idle repository costs a 304
+            source_data = self.repo_manager.fetch_repository_data(source_repo) or {}
+            pushed_at = source_data.get('pushed_at')
+            sync_key = (sync.source_repo, sync.target_repo, sync.sync_type)
+            if pushed_at is not None and self.synced_pushed_at.get(sync_key) == pushed_at:
+                sync.status = 'completed'
+                sync.last_sync = now_iso()
+                logger.info(f"✓ No new commits in {source_repo.name} since last {sync.sync_type} sync; skipped")
+                return True
+            
             # Different sync types require different approaches
             if sync.sync_type == 'code':
-                return self.sync_code(source_repo, target_repo, sync)
+                success = self.sync_code(source_repo, target_repo, sync)
             elif sync.sync_type == 'config':
-                return self.sync_config(source_repo, target_repo, sync)
+                success = self.sync_config(source_repo, target_repo, sync)
             elif sync.sync_type == 'dependencies':
-                return self.sync_dependencies(source_repo, target_repo, sync)
+                success = self.sync_dependencies(source_repo, target_repo, sync)
             elif sync.sync_type == 'docs':
-                return self.sync_docs(source_repo, target_repo, sync)
+                success = self.sync_docs(source_repo, target_repo, sync)
             else:
-                print(f"✗ Unknown sync type: {sync.sync_type}")
+                logger.error(f"✗ Unknown sync type: {sync.sync_type}")
                 return False
+            
+            if success and pushed_at is not None:
+                self.synced_pushed_at[sync_key] = pushed_at
+            return success
                 
         except Exception as e:
-            print(f"✗ Error executing sync: {e}")
+            logger.error(f"✗ Error executing sync: {e}")
             return False
     
     def sync_code(self, source_repo: Repository, target_repo: Repository, sync: RepositorySync) -> bool:
@@ -312,45 +635,86 @@ class RepositorySynchronizer:
             # 3. Merging or cherry-picking commits
             # 4. Pushing changes
             
-            print(f"Syncing code from {source_repo.name} to {target_repo.name}")
+            logger.info(f"Syncing code from {source_repo.name} to {target_repo.name}")
+            
+            with tempfile.TemporaryDirectory(prefix='repo-sync-') as workdir:
+                # Both clones run at once; each sync runs on its own worker thread and event loop
+                if not asyncio.run(self.clone_repositories(source_repo, target_repo, workdir)):
+                    sync.status = 'failed'
+                    return False
             
             # For now, just update sync status
             sync.status = 'completed'
-            sync.last_sync = datetime.now().isoformat()
+            sync.last_sync = now_iso()
             
             return True
             
         except Exception as e:
-            print(f"✗ Code sync failed: {e}")
+            logger.error(f"✗ Code sync failed: {e}")
             sync.status = 'failed'
             return False
     
+    async def clone_repositories(self, source_repo: Repository, target_repo: Repository, workdir: str) -> bool:
+        """Shallow-clone the source and target repositories side by side under workdir"""
+        results = await asyncio.gather(
+            self.clone_repository(source_repo, os.path.join(workdir, 'source')),
+            self.clone_repository(target_repo, os.path.join(workdir, 'target'))
+        )
+        return all(results)
+    
+    async def clone_repository(self, repo: Repository, dest: str) -> bool:
+        """Shallow-clone one branch of a repository into dest"""
+        owner, repo_name = repo.owner_name
+        
+        # The token reaches git through its environment, never the clone URL or argv
+        credentials = base64.b64encode(f"x-access-token:{repo.access_token}".encode()).decode()
+        env = {
+            **os.environ,
+            'GIT_TERMINAL_PROMPT': '0',
+            'GIT_CONFIG_COUNT': '1',
+            'GIT_CONFIG_KEY_0': 'http.https://github.com/.extraheader',
+            'GIT_CONFIG_VALUE_0': f'Authorization: Basic {credentials}'
+        }
+        
+        returncode, _, stderr = await run_git(
+            'clone', '--depth=1', '--single-branch', '--branch', repo.branch,
+            f'https://github.com/{owner}/{repo_name}.git', dest, env=env
+        )
+        
+        if returncode != 0:
+            message = stderr.decode(errors='replace').strip()
+            if repo.access_token:
+                message = message.replace(repo.access_token, '***')
+            logger.error(f"✗ Clone of {repo.name} failed: {message}")
+            return False
+        return True
+    
     def sync_config(self, source_repo: Repository, target_repo: Repository, sync: RepositorySync) -> bool:
         """Sync configuration files between repositories"""
         try:
-            print(f"Syncing config from {source_repo.name} to {target_repo.name}")
+            logger.info(f"Syncing config from {source_repo.name} to {target_repo.name}")
             
             # Sync configuration files like package.json, tsconfig.json, etc.
             config_files = ['package.json', 'tsconfig.json', 'eslint.config.js', '.gitignore']
             
             for config_file in config_files:
                 # This would involve copying config files between repos
-                print(f"  Syncing {config_file}")
+                logger.debug(f"  Syncing {config_file}")
             
             sync.status = 'completed'
-            sync.last_sync = datetime.now().isoformat()
+            sync.last_sync = now_iso()
             
             return True
             
         except Exception as e:
-            print(f"✗ Config sync failed: {e}")
+            logger.error(f"✗ Config sync failed: {e}")
             sync.status = 'failed'
             return False
     
     def sync_dependencies(self, source_repo: Repository, target_repo: Repository, sync: RepositorySync) -> bool:
         """Sync dependencies between repositories"""
         try:
-            print(f"Syncing dependencies from {source_repo.name} to {target_repo.name}")
+            logger.info(f"Syncing dependencies from {source_repo.name} to {target_repo.name}")
             
             # This would involve:
             # 1. Reading package.json from source
@@ -358,59 +722,83 @@ class RepositorySynchronizer:
             # 3. Running npm install
             
             sync.status = 'completed'
-            sync.last_sync = datetime.now().isoformat()
+            sync.last_sync = now_iso()
             
             return True
             
         except Exception as e:
-            print(f"✗ Dependency sync failed: {e}")
+            logger.error(f"✗ Dependency sync failed: {e}")
             sync.status = 'failed'
             return False
     
     def sync_docs(self, source_repo: Repository, target_repo: Repository, sync: RepositorySync) -> bool:
         """Sync documentation between repositories"""
         try:
-            print(f"Syncing docs from {source_repo.name} to {target_repo.name}")
+            logger.info(f"Syncing docs from {source_repo.name} to {target_repo.name}")
             
             # Sync documentation files
             doc_files = ['README.md', 'docs/', 'CHANGELOG.md']
             
             for doc_file in doc_files:
-                print(f"  Syncing {doc_file}")
+                logger.debug(f"  Syncing {doc_file}")
             
             sync.status = 'completed'
-            sync.last_sync = datetime.now().isoformat()
+            sync.last_sync = now_iso()
             
             return True
             
         except Exception as e:
-            print(f"✗ Docs sync failed: {e}")
+            logger.error(f"✗ Docs sync failed: {e}")
             sync.status = 'failed'
             return False
     
     def process_sync_queue(self):
         """Process the synchronization queue"""
+        # Take the whole queue, then run the syncs without holding the lock
         with self.lock:
-            while self.sync_queue:
-                sync = self.sync_queue.pop(0)
-                
-                print(f"Processing sync: {sync.sync_id}")
-                
-                success = self.execute_sync(sync)
-                
-                # Record sync history
-                self.sync_history.append({
-                    'sync_id': sync.sync_id,
-                    'source_repo': sync.source_repo,
-                    'target_repo': sync.target_repo,
-                    'sync_type': sync.sync_type,
-                    'status': sync.status,
-                    'completed_at': datetime.now().isoformat()
-                })
-                
-                # Keep only last 100 sync records
-                if len(self.sync_history) > 100:
-                    self.sync_history = self.sync_history[-100:]
+            pending_syncs = self.sync_queue
+            self.sync_queue = deque()
+        
+        futures = {}
+        for sync in pending_syncs:
+            logger.info(f"Processing sync: {sync.sync_id}")
+            futures[self.pool.submit(self.execute_sync, sync)] = sync
+        
+        for future in as_completed(futures):
+            sync = futures[future]
+            
+            # Record sync history
+            record = {
+                'sync_id': sync.sync_id,
+                'source_repo': sync.source_repo,
+                'target_repo': sync.target_repo,
+                'sync_type': sync.sync_type,
+                'status': sync.status,
+                'completed_at': now_iso()
+            }
+            
+            with self.lock:
+                self.sync_history.append(record)
+    
+    def shutdown(self):
+        """Wait for running syncs and stop the worker threads"""
+        self.pool.shutdown(wait=True)
+
+async def run_git(*args: str, cwd: Optional[str] = None,
+                  env: Optional[Dict[str, str]] = None) -> Tuple[int, bytes, bytes]:
+    """Run a git command on the event loop; returns (returncode, stdout, stderr)"""
+    process = await asyncio.create_subprocess_exec(
+        'git', *args, cwd=cwd, env=env,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await process.communicate()
+    except asyncio.CancelledError:
+        # Reap the child rather than leaving git running in the background
+        process.kill()
+        await process.wait()
+        raise
+    return process.returncode, stdout, stderr
 
 class MultiRepositoryAgent:
     """Agent that can work across multiple repositories"""
@@ -421,22 +809,19 @@ class MultiRepositoryAgent:
         self.repo_manager = repo_manager
         self.coordinator = coordinator
         self.current_tasks = {}
-        self.work_history = []
+        # Recent work records only; the summary totals below cover the agent's whole lifetime
+        self.work_history = deque(maxlen=1000)
+        self.completed_count = 0
+        self.succeeded_count = 0
+        self.repositories_worked = set()
     
     def get_available_tasks(self) -> List[CrossRepoTask]:
         """Get tasks available for this agent"""
-        available_tasks = []
-        
-        ready_tasks = self.coordinator.get_ready_tasks()
-        
-        for task in ready_tasks:
-            # Check if this agent is assigned to any repository in the task
-            for repo_id, assigned_agent in task.assigned_agents.items():
-                if assigned_agent == self.agent_role:
-                    available_tasks.append(task)
-                    break
-        
-        return available_tasks
+        return self.coordinator.get_ready_tasks_for_role(self.agent_role)
+    
+    def wait_for_available_tasks(self, timeout: float = 60.0) -> List[CrossRepoTask]:
+        """Wait until a task is available for this agent, rather than polling get_available_tasks"""
+        return self.coordinator.wait_for_ready_tasks(self.agent_role, timeout)
     
     def start_task(self, task_id: str) -> bool:
         """Start working on a cross-repository task"""
@@ -446,7 +831,7 @@ class MultiRepositoryAgent:
         task = self.coordinator.cross_repo_tasks[task_id]
         
         if not self.coordinator.can_start_task(task_id):
-            print(f"✗ Task {task_id} dependencies not met")
+            logger.warning(f"✗ Task {task_id} dependencies not met")
             return False
         
         # Update task status
@@ -454,12 +839,12 @@ class MultiRepositoryAgent:
         
         # Record work start
         self.current_tasks[task_id] = {
-            'started_at': datetime.now().isoformat(),
+            'started_at': now_iso(),
             'repositories': task.repositories,
             'status': 'in_progress'
         }
         
-        print(f"✓ Agent {self.agent_role} started task {task_id}")
+        logger.info(f"✓ Agent {self.agent_role} started task {task_id}")
         return True
     
     def complete_task(self, task_id: str, success: bool, results: Dict[str, Any]) -> bool:
@@ -476,18 +861,21 @@ class MultiRepositoryAgent:
             'task_id': task_id,
             'agent_role': self.agent_role,
             'started_at': self.current_tasks[task_id]['started_at'],
-            'completed_at': datetime.now().isoformat(),
+            'completed_at': now_iso(),
             'success': success,
             'results': results,
             'repositories': self.current_tasks[task_id]['repositories']
         }
         
         self.work_history.append(work_record)
+        self.completed_count += 1
+        self.succeeded_count += success
+        self.repositories_worked.update(work_record['repositories'])
         
         # Remove from current tasks
         del self.current_tasks[task_id]
         
-        print(f"✓ Agent {self.agent_role} completed task {task_id} with status {status}")
+        logger.info(f"✓ Agent {self.agent_role} completed task {task_id} with status {status}")
         return True
     
     def get_work_summary(self) -> Dict[str, Any]:
@@ -495,10 +883,10 @@ class MultiRepositoryAgent:
         return {
             'agent_role': self.agent_role,
             'current_tasks': len(self.current_tasks),
-            'total_completed': len(self.work_history),
-            'success_rate': sum(1 for w in self.work_history if w['success']) / len(self.work_history) if self.work_history else 0,
-            'repositories_worked': list(set(repo for w in self.work_history for repo in w['repositories'])),
-            'recent_work': self.work_history[-5:] if self.work_history else []
+            'total_completed': self.completed_count,
+            'success_rate': self.succeeded_count / self.completed_count if self.completed_count else 0,
+            'repositories_worked': list(self.repositories_worked),
+            'recent_work': list(islice(reversed(self.work_history), 5))[::-1]
         }
 
 class MultiRepositorySystem:
@@ -507,7 +895,7 @@ class MultiRepositorySystem:
     def __init__(self):
         self.repo_manager = RepositoryManager()
         self.coordinator = CrossRepositoryCoordinator(self.repo_manager)
-        self.synchronizer = RepositorySynchronizer(self.repo_manager)
+        self.synchronizer = RepositorySynchronizer(self.repo_manager, self.repo_manager.session)
         self.agents = {}
         self.lock = threading.Lock()
     
@@ -519,7 +907,31 @@ class MultiRepositorySystem:
     
     def add_repository(self, repo_config: Dict[str, Any]) -> bool:
         """Add a repository to the system"""
-        repo = Repository(
+        try:
+            repo = self.build_repository(repo_config)
+        except ValueError as e:
+            logger.warning(f"✗ Repository {repo_config['name']} rejected: {e}")
+            return False
+        return self.repo_manager.add_repository(repo)
+    
+    def add_repositories(self, repo_configs: List[Dict[str, Any]]) -> Dict[str, bool]:
+        """Add many repositories, validated together; returns repo_id -> added"""
+        results = {}
+        repos = []
+        for repo_config in repo_configs:
+            try:
+                repos.append(self.build_repository(repo_config))
+            except ValueError as e:
+                logger.warning(f"✗ Repository {repo_config['name']} rejected: {e}")
+                results[repo_config['repo_id']] = False
+        
+        results.update(self.repo_manager.add_repositories(repos))
+        return results
+    
+    @staticmethod
+    def build_repository(repo_config: Dict[str, Any]) -> Repository:
+        """Build a Repository from its configuration dict"""
+        return Repository(
             repo_id=repo_config['repo_id'],
             name=repo_config['name'],
             owner=repo_config['owner'],
@@ -529,11 +941,9 @@ class MultiRepositorySystem:
             description=repo_config.get('description', ''),
             tags=repo_config.get('tags', []),
             priority=repo_config.get('priority', 1),
-            last_sync=datetime.now().isoformat(),
+            last_sync=now_iso(),
             status='active'
         )
-        
-        return self.repo_manager.add_repository(repo)
     
     def create_cross_repo_task(self, task_config: Dict[str, Any]) -> bool:
         """Create a cross-repository task"""
@@ -544,8 +954,8 @@ class MultiRepositorySystem:
             repositories=task_config['repositories'],
             dependencies=task_config.get('dependencies', []),
             status='pending',
-            created_at=datetime.now().isoformat(),
-            updated_at=datetime.now().isoformat(),
+            created_at=now_iso(),
+            updated_at=now_iso(),
             assigned_agents={}
         )
         
@@ -558,7 +968,7 @@ class MultiRepositorySystem:
             source_repo=source_repo,
             target_repo=target_repo,
             sync_type=sync_type,
-            last_sync=datetime.now().isoformat(),
+            last_sync=now_iso(),
             status='pending',
             conflicts=[]
         )
@@ -566,22 +976,39 @@ class MultiRepositorySystem:
         self.synchronizer.schedule_sync(sync)
         return True
     
+    def to_json(self) -> bytes:
+        """Serialize repositories and cross-repo tasks as JSON; access tokens are left out"""
+        return dumps_bytes({
+            'repositories': [
+                {name: value for name, value in asdict(repo).items() if name != 'access_token'}
+                for repo in self.repo_manager.list_repositories()
+            ],
+            'cross_repo_tasks': list(self.coordinator.cross_repo_tasks.values())
+        })
+    
+    def shutdown(self):
+        """Stop background sync workers and close the GitHub connection pool"""
+        self.synchronizer.shutdown()
+        self.repo_manager.session.close()
+    
     def get_system_status(self) -> Dict[str, Any]:
         """Get overall system status"""
         with self.lock:
+            repo_counts = self.repo_manager.repo_status_counts
+            task_counts = self.coordinator.task_status_counts
             return {
                 'repositories': {
                     'total': len(self.repo_manager.repositories),
-                    'active': len([r for r in self.repo_manager.repositories.values() if r.status == 'active']),
-                    'inactive': len([r for r in self.repo_manager.repositories.values() if r.status == 'inactive']),
-                    'error': len([r for r in self.repo_manager.repositories.values() if r.status == 'error'])
+                    'active': repo_counts['active'],
+                    'inactive': repo_counts['inactive'],
+                    'error': repo_counts['error']
                 },
                 'cross_repo_tasks': {
                     'total': len(self.coordinator.cross_repo_tasks),
-                    'pending': len([t for t in self.coordinator.cross_repo_tasks.values() if t.status == 'pending']),
-                    'in_progress': len([t for t in self.coordinator.cross_repo_tasks.values() if t.status == 'in_progress']),
-                    'completed': len([t for t in self.coordinator.cross_repo_tasks.values() if t.status == 'completed']),
-                    'failed': len([t for t in self.coordinator.cross_repo_tasks.values() if t.status == 'failed'])
+                    'pending': task_counts['pending'],
+                    'in_progress': task_counts['in_progress'],
+                    'completed': task_counts['completed'],
+                    'failed': task_counts['failed']
                 },
                 'sync_queue': len(self.synchronizer.sync_queue),
                 'agents': {
@@ -590,8 +1017,15 @@ class MultiRepositorySystem:
                 }
             }
 
+def setup_logging():
+    """Route log records through a queue so worker threads never block on console writes"""
+    if setup_queue_logging('%(message)s', os.getenv('MULTI_REPO_LOG_LEVEL', 'INFO').upper()):
+        # httpx logs every request at INFO
+        logging.getLogger('httpx').setLevel(logging.WARNING)
+
 def main():
     """Main multi-repository system function"""
+    setup_logging()
     print("Multi-Repository Support System starting...")
     
     # Initialize system
@@ -622,13 +1056,18 @@ def main():
     ]
     
     print("Adding sample repositories...")
+    repo_configs = []
     for repo_config in sample_repos:
         # Skip adding if no real token provided
         if repo_config['access_token'] == 'your_github_token_here':
             print(f"⚠️  Skipping {repo_config['name']} - no access token provided")
             continue
-        
-        if multi_repo_system.add_repository(repo_config):
+        repo_configs.append(repo_config)
+    
+    # Validate every repository up front, one GraphQL query per token
+    added = multi_repo_system.add_repositories(repo_configs)
+    for repo_config in repo_configs:
+        if added[repo_config['repo_id']]:
             print(f"✓ Added repository: {repo_config['name']}")
         else:
             print(f"✗ Failed to add repository: {repo_config['name']}")
@@ -665,11 +1104,15 @@ def main():
     
     # Keep the system running
     try:
+        task_changed = multi_repo_system.coordinator.task_changed
         while True:
-            time.sleep(60)
+            # Report immediately on task changes, and at least once a minute otherwise
+            with task_changed:
+                task_changed.wait(timeout=60)
             print(f"Multi-repo system status: {len(multi_repo_system.repo_manager.repositories)} repositories managed")
     except KeyboardInterrupt:
         print("Shutting down multi-repository system...")
+        multi_repo_system.shutdown()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
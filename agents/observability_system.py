@@ -6,20 +6,47 @@ Handles metrics collection, logging, and system monitoring
 
 import os
 import sys
-import json
+import io
+import csv
 import time
-import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
-from collections import defaultdict, deque
+import itertools
+from typing import Dict, List, Any, ItemsView
+from dataclasses import dataclass, field
+from collections import Counter, OrderedDict, defaultdict, deque
 import threading
+import weakref
+from types import MappingProxyType
 import psutil
-import requests
 
 # Add mcp_servers to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'mcp_servers'))
 
+from _serialize import dumps_indented
+from _timestamps import now_iso, format_timestamp
+
+# Power of two so a metric name maps to its shard with a mask
+METRIC_SHARDS = 16
+
+# Log level counters are split across this many locks, by agent role
+LOG_SHARDS = 8
+
+# Default number of recent values kept per metric for summaries
+AGGREGATE_WINDOW = 100
+
+# Readers reuse a system sample taken within this many seconds
+SYSTEM_METRICS_MAX_AGE = 5.0
+
+# Disk usage and network counters change slowly; reuse readings this many seconds old
+DISK_SAMPLE_TTL = 5.0
+NETWORK_SAMPLE_TTL = 1.0
+
+# Seconds between monitoring checks, and the longer pause after a failed one
+MONITOR_INTERVAL = 30
+MONITOR_ERROR_BACKOFF = 60
+
+# Number of finished tasks kept per agent
+TASK_HISTORY = 1000
+
 @dataclass
 class Metric:
     name: str
@@ -37,86 +64,272 @@ class LogEntry:
     task_id: str
     message: str
     context: Dict[str, Any]
+    timestamp_epoch: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict of the entry; unlike asdict, context is shared rather than deep-copied"""
+        return {
+            "timestamp": self.timestamp,
+            "level": self.level,
+            "agent_role": self.agent_role,
+            "task_id": self.task_id,
+            "message": self.message,
+            "context": self.context,
+            "timestamp_epoch": self.timestamp_epoch
+        }
+
+@dataclass(slots=True)
+class MetricWindow:
+    """Last `size` values of a metric with running sum, min and max"""
+    size: int = AGGREGATE_WINDOW
+    values: deque = field(init=False)
+    total: float = 0.0
+    appended: int = 0
+    # Monotonic (index, value) queues; the front is the window min/max
+    min_queue: deque = field(default_factory=deque)
+    max_queue: deque = field(default_factory=deque)
+
+    def __post_init__(self):
+        self.values = deque(maxlen=self.size)
+
+    def append(self, value: float):
+        """Add a value, evicting the oldest once the window is full"""
+        if len(self.values) == self.size:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+
+        index = self.appended
+        self.appended += 1
+        # Resum once per window so float error from the subtractions stays bounded
+        if self.appended % self.size == 0:
+            self.total = sum(self.values)
+
+        oldest = index - self.size
+        while self.min_queue and self.min_queue[-1][1] >= value:
+            self.min_queue.pop()
+        self.min_queue.append((index, value))
+        if self.min_queue[0][0] <= oldest:
+            self.min_queue.popleft()
+
+        while self.max_queue and self.max_queue[-1][1] <= value:
+            self.max_queue.pop()
+        self.max_queue.append((index, value))
+        if self.max_queue[0][0] <= oldest:
+            self.max_queue.popleft()
+
+@dataclass(slots=True)
+class MetricShard:
+    """Aggregates for the metric names hashed to one lock"""
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    aggregates: Dict[str, MetricWindow] = field(default_factory=dict)
+
+@dataclass(slots=True)
+class IndexShard:
+    """Per-key metric buckets for the agent roles or task ids hashed to one lock"""
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    # Key -> deque of (sequence number, metric); ordered by each key's latest record
+    buckets: OrderedDict = field(default_factory=OrderedDict)
+
+@dataclass(slots=True, weakref_slot=True)
+class ThreadCounts:
+    """One thread's metric record counts, held in thread-local storage"""
+    counts: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
 
 class MetricsCollector:
     """Collects and stores metrics from agents"""
     
-    def __init__(self, max_metrics: int = 10000):
+    def __init__(self, max_metrics: int = 10000, aggregate_window: int = AGGREGATE_WINDOW):
         self.metrics = deque(maxlen=max_metrics)
-        self.metric_counters = defaultdict(int)
-        self.metric_aggregates = defaultdict(list)
-        self.lock = threading.Lock()
+        # Summaries cost O(1) at any window size, so large windows only cost memory
+        self.aggregate_window = aggregate_window
+        # Sharded like the aggregates; a bucket sheds metrics that have left
+        # self.metrics, and a key is dropped once all of its metrics have
+        self.metrics_by_agent = [IndexShard() for _ in range(METRIC_SHARDS)]
+        self.metrics_by_task = [IndexShard() for _ in range(METRIC_SHARDS)]
+        # next() on a count is atomic, so sequence numbers need no lock
+        self.sequence = itertools.count()
+        self.latest_sequence = -1
+        self.shards = [MetricShard() for _ in range(METRIC_SHARDS)]
+        # Per-thread record counts, written only by their own thread and summed on read;
+        # a thread's counts fold into retired_counts when it exits
+        self.local_counts = threading.local()
+        self.thread_counts = {}
+        self.retired_counts = Counter()
+        self.thread_counts_lock = threading.Lock()
+    
+    def counts_for_current_thread(self) -> Dict[str, int]:
+        """Get this thread's record counts, registering them on first use"""
+        holder = getattr(self.local_counts, "holder", None)
+        if holder is None:
+            holder = self.local_counts.holder = ThreadCounts()
+            with self.thread_counts_lock:
+                self.thread_counts[id(holder.counts)] = holder.counts
+            # Thread-local storage is released when the thread exits, which fires this
+            weakref.finalize(holder, self.retire_thread_counts, holder.counts)
+        return holder.counts
+    
+    def retire_thread_counts(self, counts: Dict[str, int]):
+        """Fold an exited thread's counts into the shared total"""
+        with self.thread_counts_lock:
+            del self.thread_counts[id(counts)]
+            self.retired_counts.update(counts)
+    
+    def shard_for(self, metric_name: str) -> MetricShard:
+        """Get the shard that owns a metric name"""
+        return self.shards[hash(metric_name) & (METRIC_SHARDS - 1)]
+    
+    def stale_sequence(self) -> int:
+        """Highest sequence number already evicted from self.metrics"""
+        return self.latest_sequence - self.metrics.maxlen
+    
+    @staticmethod
+    def prune_bucket(bucket: deque, stale: int):
+        """Drop a bucket's metrics that have been evicted from self.metrics"""
+        while bucket and bucket[0][0] <= stale:
+            bucket.popleft()
+    
+    def index_metric(self, index: List[IndexShard], key: str, sequence: int, metric: Metric):
+        """Append a metric to its key's bucket and drop buckets left holding only evicted metrics"""
+        shard = index[hash(key) & (METRIC_SHARDS - 1)]
+        stale = self.stale_sequence()
+        with shard.lock:
+            bucket = shard.buckets.get(key)
+            if bucket is None:
+                bucket = shard.buckets[key] = deque()
+            else:
+                shard.buckets.move_to_end(key)
+            bucket.append((sequence, metric))
+            self.prune_bucket(bucket, stale)
+            
+            # The least recently recorded keys come first; a bucket whose newest
+            # metric is evicted is entirely evicted
+            while shard.buckets:
+                oldest_key, oldest = next(iter(shard.buckets.items()))
+                if oldest and oldest[-1][0] > stale:
+                    break
+                del shard.buckets[oldest_key]
+    
+    def read_index(self, index: List[IndexShard], key: str) -> List[Metric]:
+        """Copy the stored metrics in a key's bucket"""
+        shard = index[hash(key) & (METRIC_SHARDS - 1)]
+        stale = self.stale_sequence()
+        with shard.lock:
+            bucket = shard.buckets.get(key)
+            if bucket is None:
+                return []
+            self.prune_bucket(bucket, stale)
+            if not bucket:
+                del shard.buckets[key]
+            return [metric for _, metric in bucket]
     
     def record_metric(self, metric: Metric):
         """Record a new metric"""
-        with self.lock:
-            self.metrics.append(metric)
-            self.metric_counters[metric.name] += 1
-            
-            # Update aggregates
-            self.metric_aggregates[metric.name].append(metric.value)
-            
-            # Keep only last 100 values for aggregates
-            if len(self.metric_aggregates[metric.name]) > 100:
-                self.metric_aggregates[metric.name] = self.metric_aggregates[metric.name][-100:]
+        # deque.append is atomic; the indexes are sharded by key, so threads
+        # recording for different agents and tasks rarely share a lock
+        sequence = next(self.sequence)
+        self.metrics.append(metric)
+        self.latest_sequence = sequence
+        self.index_metric(self.metrics_by_agent, metric.agent_role, sequence, metric)
+        self.index_metric(self.metrics_by_task, metric.task_id, sequence, metric)
+        self.counts_for_current_thread()[metric.name] += 1
+        
+        shard = self.shard_for(metric.name)
+        with shard.lock:
+            window = shard.aggregates.get(metric.name)
+            if window is None:
+                window = shard.aggregates[metric.name] = MetricWindow(self.aggregate_window)
+            window.append(metric.value)
+    
+    def snapshot(self) -> List[Metric]:
+        """Copy the stored metrics for iteration"""
+        # list() copies the deque in one C call, safe against concurrent appends
+        return list(self.metrics)
+    
+    def get_metric_counts(self) -> Dict[str, int]:
+        """Get the total number of records per metric name across all threads"""
+        # Copy both under the lock so a thread retiring meanwhile is counted once
+        with self.thread_counts_lock:
+            thread_counts = list(self.thread_counts.values())
+            totals = Counter(self.retired_counts)
+        for counts in thread_counts:
+            # dict() copies in one C call, so the owning thread cannot resize it mid-read
+            totals.update(dict(counts))
+        return dict(totals)
     
     def get_metric_summary(self, metric_name: str) -> Dict[str, Any]:
         """Get summary statistics for a metric"""
-        with self.lock:
-            values = self.metric_aggregates.get(metric_name, [])
+        shard = self.shard_for(metric_name)
+        with shard.lock:
+            window = shard.aggregates.get(metric_name)
             
-            if not values:
+            if window is None:
                 return {"count": 0, "avg": 0, "min": 0, "max": 0}
             
+            count = len(window.values)
             return {
-                "count": len(values),
-                "avg": sum(values) / len(values),
-                "min": min(values),
-                "max": max(values),
-                "latest": values[-1] if values else 0
+                "count": count,
+                "avg": window.total / count,
+                "min": window.min_queue[0][1],
+                "max": window.max_queue[0][1],
+                "latest": window.values[-1]
             }
     
     def get_metrics_by_agent(self, agent_role: str) -> List[Metric]:
         """Get all metrics for a specific agent"""
-        with self.lock:
-            return [m for m in self.metrics if m.agent_role == agent_role]
+        return self.read_index(self.metrics_by_agent, agent_role)
     
     def get_metrics_by_task(self, task_id: str) -> List[Metric]:
         """Get all metrics for a specific task"""
-        with self.lock:
-            return [m for m in self.metrics if m.task_id == task_id]
+        return self.read_index(self.metrics_by_task, task_id)
+
+@dataclass(slots=True)
+class LogShard:
+    """Log level counts for the agent roles hashed to one lock"""
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    levels: Counter = field(default_factory=Counter)
 
 class LogCollector:
     """Collects and stores logs from agents"""
     
     def __init__(self, max_logs: int = 5000):
         self.logs = deque(maxlen=max_logs)
-        self.log_levels = defaultdict(int)
-        self.lock = threading.Lock()
+        self.shards = [LogShard() for _ in range(LOG_SHARDS)]
     
     def record_log(self, log_entry: LogEntry):
         """Record a new log entry"""
-        with self.lock:
-            self.logs.append(log_entry)
-            self.log_levels[log_entry.level] += 1
+        # deque.append is atomic, so only the level counts need a lock
+        self.logs.append(log_entry)
+        
+        shard = self.shards[hash(log_entry.agent_role) % LOG_SHARDS]
+        with shard.lock:
+            shard.levels[log_entry.level] += 1
+    
+    def get_log_level_counts(self) -> Dict[str, int]:
+        """Get the number of logs recorded at each level"""
+        counts = Counter()
+        for shard in self.shards:
+            with shard.lock:
+                counts.update(shard.levels)
+        return dict(counts)
+    
+    def snapshot(self) -> List[LogEntry]:
+        """Copy the stored logs for iteration"""
+        # list() copies the deque in one C call, safe against concurrent appends
+        return list(self.logs)
     
     def get_logs_by_level(self, level: str) -> List[LogEntry]:
         """Get logs by level"""
-        with self.lock:
-            return [log for log in self.logs if log.level == level]
+        return [log for log in self.snapshot() if log.level == level]
     
     def get_logs_by_agent(self, agent_role: str) -> List[LogEntry]:
         """Get logs by agent"""
-        with self.lock:
-            return [log for log in self.logs if log.agent_role == agent_role]
+        return [log for log in self.snapshot() if log.agent_role == agent_role]
     
     def get_recent_logs(self, minutes: int = 10) -> List[LogEntry]:
         """Get recent logs within specified minutes"""
-        cutoff_time = datetime.now() - timedelta(minutes=minutes)
-        
-        with self.lock:
-            return [log for log in self.logs 
-                   if datetime.fromisoformat(log.timestamp) > cutoff_time]
+        cutoff = time.time() - minutes * 60
+        return [log for log in self.snapshot() if log.timestamp_epoch > cutoff]
 
 class SystemMonitor:
     """Monitors system resources and performance"""
@@ -126,12 +339,50 @@ class SystemMonitor:
         self.memory_history = deque(maxlen=60)
         self.disk_history = deque(maxlen=60)
         self.network_history = deque(maxlen=60)
+        self.latest_metrics = {}
+        self.latest_sample_time = 0.0
+        self.disk_percent = 0.0
+        self.disk_sample_time = float('-inf')
+        self.network_bytes = 0
+        self.network_sample_time = float('-inf')
+        
+        # Prime psutil so later non-blocking calls measure from here
+        psutil.cpu_percent(interval=None)
     
     def collect_system_metrics(self) -> Dict[str, Any]:
         """Collect current system metrics"""
+        self.latest_metrics = self.sample_system_metrics()
+        self.latest_sample_time = time.monotonic()
+        return self.latest_metrics
+    
+    def get_latest_metrics(self, max_age: float = SYSTEM_METRICS_MAX_AGE) -> Dict[str, Any]:
+        """Get the last system sample, collecting a new one if it is stale"""
+        if self.latest_metrics and time.monotonic() - self.latest_sample_time < max_age:
+            return self.latest_metrics
+        return self.collect_system_metrics()
+    
+    def read_disk_percent(self, now: float) -> float:
+        """Root filesystem usage, re-read via statvfs at most every DISK_SAMPLE_TTL seconds"""
+        if now - self.disk_sample_time >= DISK_SAMPLE_TTL:
+            disk = psutil.disk_usage('/')
+            self.disk_percent = (disk.used / disk.total) * 100
+            self.disk_sample_time = now
+        return self.disk_percent
+    
+    def read_network_bytes(self, now: float) -> int:
+        """Total bytes sent and received, re-read at most every NETWORK_SAMPLE_TTL seconds"""
+        if now - self.network_sample_time >= NETWORK_SAMPLE_TTL:
+            network = psutil.net_io_counters()
+            self.network_bytes = network.bytes_sent + network.bytes_recv
+            self.network_sample_time = now
+        return self.network_bytes
+    
+    def sample_system_metrics(self) -> Dict[str, Any]:
+        """Read system metrics from psutil"""
+        now = time.monotonic()
         try:
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # CPU usage since the previous sample, without blocking
+            cpu_percent = psutil.cpu_percent(interval=None)
             self.cpu_history.append(cpu_percent)
             
             # Memory usage
@@ -140,13 +391,11 @@ class SystemMonitor:
             self.memory_history.append(memory_percent)
             
             # Disk usage
-            disk = psutil.disk_usage('/')
-            disk_percent = (disk.used / disk.total) * 100
+            disk_percent = self.read_disk_percent(now)
             self.disk_history.append(disk_percent)
             
             # Network I/O
-            network = psutil.net_io_counters()
-            network_bytes = network.bytes_sent + network.bytes_recv
+            network_bytes = self.read_network_bytes(now)
             self.network_history.append(network_bytes)
             
             return {
@@ -154,10 +403,10 @@ class SystemMonitor:
                 "memory_percent": memory_percent,
                 "disk_percent": disk_percent,
                 "network_bytes": network_bytes,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso()
             }
         except Exception as e:
-            return {"error": str(e), "timestamp": datetime.now().isoformat()}
+            return {"error": str(e), "timestamp": now_iso()}
     
     def get_system_trends(self) -> Dict[str, Any]:
         """Get system performance trends"""
@@ -172,60 +421,78 @@ class AgentPerformanceMonitor:
     """Monitors agent performance and efficiency"""
     
     def __init__(self):
-        self.agent_tasks = defaultdict(list)
-        self.agent_performance = defaultdict(dict)
-        self.task_durations = defaultdict(list)
+        # In-flight tasks per agent, keyed by task id
+        self.agent_tasks = defaultdict(dict)
+        self.completed_tasks = defaultdict(lambda: deque(maxlen=TASK_HISTORY))
+        # Read-only view, replaced wholesale under registration_lock when a role
+        # first completes a task; readers iterate whichever snapshot is current
+        self.agent_performance = MappingProxyType({})
+        self.registration_lock = threading.Lock()
+        self.task_durations = defaultdict(lambda: deque(maxlen=TASK_HISTORY))
+        # One lock per agent role; Lock is a C factory, so creating one is atomic
+        self.locks = defaultdict(threading.Lock)
     
     def record_task_start(self, agent_role: str, task_id: str):
         """Record when an agent starts a task"""
-        self.agent_tasks[agent_role].append({
+        task = {
             "task_id": task_id,
-            "start_time": datetime.now().isoformat(),
+            "start_time": now_iso(),
+            "start_epoch": time.time(),
             "status": "started"
-        })
+        }
+        with self.locks[agent_role]:
+            self.agent_tasks[agent_role][task_id] = task
     
     def record_task_completion(self, agent_role: str, task_id: str, 
                              success: bool, metrics: Dict[str, Any]):
         """Record when an agent completes a task"""
-        # Find the task
-        for task in self.agent_tasks[agent_role]:
-            if task["task_id"] == task_id and task["status"] == "started":
-                start_time = datetime.fromisoformat(task["start_time"])
-                duration = (datetime.now() - start_time).total_seconds()
-                
-                task["end_time"] = datetime.now().isoformat()
-                task["duration"] = duration
-                task["status"] = "completed" if success else "failed"
-                task["metrics"] = metrics
-                
-                # Record duration
-                self.task_durations[agent_role].append(duration)
-                
-                # Update performance metrics
-                self.update_performance_metrics(agent_role, duration, success, metrics)
-                break
+        with self.locks[agent_role]:
+            task = self.agent_tasks[agent_role].pop(task_id, None)
+        if task is None:
+            return
+        
+        # The popped task is owned by this thread, so it is filled in unlocked
+        duration = time.time() - task["start_epoch"]
+        
+        task["end_time"] = now_iso()
+        task["duration"] = duration
+        task["status"] = "completed" if success else "failed"
+        task["metrics"] = metrics
+        
+        with self.locks[agent_role]:
+            self.completed_tasks[agent_role].append(task)
+            self.task_durations[agent_role].append(duration)
+        
+        # Update performance metrics
+        self.update_performance_metrics(agent_role, duration, success, metrics)
     
     def update_performance_metrics(self, agent_role: str, duration: float, 
                                   success: bool, metrics: Dict[str, Any]):
         """Update agent performance metrics"""
-        if agent_role not in self.agent_performance:
-            self.agent_performance[agent_role] = {
-                "total_tasks": 0,
-                "successful_tasks": 0,
-                "failed_tasks": 0,
-                "avg_duration": 0,
-                "total_duration": 0
-            }
-        
-        perf = self.agent_performance[agent_role]
-        perf["total_tasks"] += 1
-        perf["total_duration"] += duration
-        perf["avg_duration"] = perf["total_duration"] / perf["total_tasks"]
-        
-        if success:
-            perf["successful_tasks"] += 1
-        else:
-            perf["failed_tasks"] += 1
+        with self.locks[agent_role]:
+            perf = self.agent_performance.get(agent_role)
+            if perf is None:
+                perf = {
+                    "total_tasks": 0,
+                    "successful_tasks": 0,
+                    "failed_tasks": 0,
+                    "success_rate": 0.0,
+                    "avg_duration": 0,
+                    "total_duration": 0
+                }
+                with self.registration_lock:
+                    self.agent_performance = MappingProxyType(
+                        {**self.agent_performance, agent_role: perf})
+            
+            perf["total_tasks"] += 1
+            perf["total_duration"] += duration
+            perf["avg_duration"] = perf["total_duration"] / perf["total_tasks"]
+            
+            if success:
+                perf["successful_tasks"] += 1
+            else:
+                perf["failed_tasks"] += 1
+            perf["success_rate"] = perf["successful_tasks"] / perf["total_tasks"]
     
     def get_agent_performance(self, agent_role: str) -> Dict[str, Any]:
         """Get performance metrics for an agent"""
@@ -234,6 +501,11 @@ class AgentPerformanceMonitor:
     def get_all_performance(self) -> Dict[str, Any]:
         """Get performance metrics for all agents"""
         return dict(self.agent_performance)
+    
+    def iter_performance(self) -> ItemsView:
+        """Iterate (agent_role, performance) pairs without copying the mapping"""
+        # The copy-on-write snapshot never changes size, so iterating it is race-free
+        return self.agent_performance.items()
 
 class ObservabilityDashboard:
     """Main observability dashboard"""
@@ -244,7 +516,18 @@ class ObservabilityDashboard:
         self.system_monitor = SystemMonitor()
         self.performance_monitor = AgentPerformanceMonitor()
         self.alerts = deque(maxlen=100)
-        self.lock = threading.Lock()
+        # Wake the monitoring thread early: to run a check now, or to exit
+        self.check_requested = threading.Event()
+        self.stop_requested = threading.Event()
+    
+    def trigger_check(self):
+        """Ask the monitoring thread to run its next check immediately"""
+        self.check_requested.set()
+    
+    def stop_monitoring(self):
+        """Ask the monitoring thread to exit without waiting out its interval"""
+        self.stop_requested.set()
+        self.check_requested.set()
     
     def record_metric(self, name: str, value: float, agent_role: str, 
                      task_id: str, tags: Dict[str, str] = None):
@@ -252,7 +535,7 @@ class ObservabilityDashboard:
         metric = Metric(
             name=name,
             value=value,
-            timestamp=datetime.now().isoformat(),
+            timestamp=now_iso(),
             tags=tags or {},
             agent_role=agent_role,
             task_id=task_id
@@ -262,13 +545,15 @@ class ObservabilityDashboard:
     def record_log(self, level: str, message: str, agent_role: str, 
                   task_id: str, context: Dict[str, Any] = None):
         """Record a log entry"""
+        now = time.time()
         log_entry = LogEntry(
-            timestamp=datetime.now().isoformat(),
+            timestamp=format_timestamp(int(now)),
             level=level,
             agent_role=agent_role,
             task_id=task_id,
             message=message,
-            context=context or {}
+            context=context or {},
+            timestamp_epoch=now
         )
         self.log_collector.record_log(log_entry)
     
@@ -291,14 +576,14 @@ class ObservabilityDashboard:
         alerts = []
         
         # Check system metrics
-        system_metrics = self.system_monitor.collect_system_metrics()
+        system_metrics = self.system_monitor.get_latest_metrics()
         
         if system_metrics.get("cpu_percent", 0) > 90:
             alerts.append({
                 "type": "high_cpu",
                 "severity": "warning",
                 "message": f"High CPU usage: {system_metrics['cpu_percent']}%",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso()
             })
         
         if system_metrics.get("memory_percent", 0) > 90:
@@ -306,38 +591,39 @@ class ObservabilityDashboard:
                 "type": "high_memory",
                 "severity": "warning", 
                 "message": f"High memory usage: {system_metrics['memory_percent']}%",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso()
             })
         
         # Check agent performance
-        performance = self.performance_monitor.get_all_performance()
-        for agent_role, perf in performance.items():
-            if perf.get("total_tasks", 0) > 0:
-                success_rate = perf["successful_tasks"] / perf["total_tasks"]
+        for agent_role, perf in self.performance_monitor.iter_performance():
+            if perf["total_tasks"] > 0:
+                success_rate = perf["success_rate"]
                 if success_rate < 0.8:  # Less than 80% success rate
                     alerts.append({
                         "type": "low_success_rate",
                         "severity": "error",
                         "message": f"Low success rate for {agent_role}: {success_rate:.2%}",
-                        "timestamp": datetime.now().isoformat()
+                        "timestamp": now_iso()
                     })
         
-        # Store alerts
-        with self.lock:
-            for alert in alerts:
-                self.alerts.append(alert)
+        # Store alerts; deque.extend from a list is atomic, so no lock is needed
+        self.alerts.extend(alerts)
         
         return alerts
     
+    def get_recent_alerts(self, count: int) -> List[Dict[str, Any]]:
+        """Get the most recent alerts without copying the whole buffer"""
+        return list(itertools.islice(self.alerts, max(0, len(self.alerts) - count), None))
+    
     def get_dashboard_data(self) -> Dict[str, Any]:
         """Get comprehensive dashboard data"""
         return {
-            "timestamp": datetime.now().isoformat(),
-            "system_metrics": self.system_monitor.collect_system_metrics(),
+            "timestamp": now_iso(),
+            "system_metrics": self.system_monitor.get_latest_metrics(),
             "system_trends": self.system_monitor.get_system_trends(),
             "agent_performance": self.performance_monitor.get_all_performance(),
-            "recent_logs": [asdict(log) for log in self.log_collector.get_recent_logs(10)],
-            "alerts": list(self.alerts)[-10:],  # Last 10 alerts
+            "recent_logs": [log.to_dict() for log in self.log_collector.get_recent_logs(10)],
+            "alerts": self.get_recent_alerts(10),
             "metric_summaries": {
                 name: self.metrics_collector.get_metric_summary(name)
                 for name in ["task_duration", "success_rate", "error_count"]
@@ -346,18 +632,18 @@ class ObservabilityDashboard:
     
     def export_metrics(self, format: str = "json") -> str:
         """Export metrics in specified format"""
-        dashboard_data = self.get_dashboard_data()
+        if format == "csv":
+            metrics = self.metrics_collector.snapshot()
+            
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator="\n")
+            writer.writerow(["timestamp", "agent_role", "task_id", "metric_name", "metric_value"])
+            writer.writerows((m.timestamp, m.agent_role, m.task_id, m.name, m.value) for m in metrics)
+            return buffer.getvalue()
         
+        dashboard_data = self.get_dashboard_data()
         if format == "json":
-            return json.dumps(dashboard_data, indent=2)
-        elif format == "csv":
-            # Convert to CSV format
-            csv_lines = ["timestamp,agent_role,task_id,metric_name,metric_value"]
-            
-            for metric in self.metrics_collector.metrics:
-                csv_lines.append(f"{metric.timestamp},{metric.agent_role},{metric.task_id},{metric.name},{metric.value}")
-            
-            return "\n".join(csv_lines)
+            return dumps_indented(dashboard_data)
         else:
             return str(dashboard_data)
 
@@ -388,10 +674,14 @@ def check_and_report_alerts() -> List[Dict[str, Any]]:
     """Check for alerts and return them"""
     return observability_dashboard.check_alerts()
 
+def trigger_monitoring_check():
+    """Run the monitoring thread's system and alert check now"""
+    observability_dashboard.trigger_check()
+
 def start_monitoring_thread():
     """Start background monitoring thread"""
     def monitor():
-        while True:
+        while not observability_dashboard.stop_requested.is_set():
             try:
                 # Collect system metrics
                 observability_dashboard.system_monitor.collect_system_metrics()
@@ -403,10 +693,14 @@ def start_monitoring_thread():
                     for alert in alerts:
                         print(f"  - {alert['severity'].upper()}: {alert['message']}")
                 
-                time.sleep(30)  # Check every 30 seconds
+                interval = MONITOR_INTERVAL
             except Exception as e:
                 print(f"Error in monitoring thread: {e}")
-                time.sleep(60)
+                interval = MONITOR_ERROR_BACKOFF
+            
+            # Sleeps the full interval unless trigger_check or stop_monitoring wakes it
+            observability_dashboard.check_requested.wait(timeout=interval)
+            observability_dashboard.check_requested.clear()
     
     monitor_thread = threading.Thread(target=monitor, daemon=True)
     monitor_thread.start()
@@ -455,6 +749,8 @@ def main():
             print(f"Observability system status: {len(observability_dashboard.metrics_collector.metrics)} metrics, {len(observability_dashboard.log_collector.logs)} logs")
     except KeyboardInterrupt:
         print("Shutting down observability system...")
+        observability_dashboard.stop_monitoring()
+        monitor_thread.join()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
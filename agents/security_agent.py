@@ -15,25 +15,7 @@ import re
 # Add mcp_servers to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'mcp_servers'))
 
-def load_task_details(task_id: str) -> Dict[str, Any]:
-    """Load task details from tasks.yaml"""
-    tasks_path = os.path.join(os.path.dirname(__file__), '..', 'agents', 'tasks.yaml')
-    
-    try:
-        import yaml
-        with open(tasks_path, 'r') as f:
-            tasks = yaml.safe_load(f)
-        
-        # Find the specific task
-        for category, items in tasks.items():
-            if isinstance(items, list):
-                for item in items:
-                    if isinstance(item, dict) and item.get('id') == task_id:
-                        return item
-        
-        return {"id": task_id, "title": "Unknown task", "category": "unknown"}
-    except Exception as e:
-        return {"id": task_id, "title": "Error loading task", "error": str(e)}
+from _tasks import get_task
 
 def run_npm_audit() -> Dict[str, Any]:
     """Run npm audit for vulnerability scanning"""
@@ -366,7 +348,7 @@ def main():
     
     try:
         # Load task details
-        task_details = load_task_details(task_id)
+        task_details = get_task(task_id)
         print(f"✓ Task loaded: {task_details.get('title', 'Unknown')}")
         
         # Run security scans
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test script for ML task prioritization
+"""
+import json
+import sys
+from dataclasses import asdict
+
+from ml_prioritization_system import MLTaskPrioritizer
+
+def make_task(i: int) -> dict:
+    """Build a historical task with outcome fields"""
+    return {
+        "id": f"task-{i}",
+        "category": ["bugs", "features", "security", "docs"][i % 4],
+        "title": f"Refactor api component {i}",
+        "description": "Fix authentication performance",
+        "labels": ["urgent"] if i % 3 == 0 else [],
+        "actual_duration": 1.0 + i % 7,
+        "success": i % 5 != 0,
+        "effort_score": (i % 10) / 10
+    }
+
+def test_model_predictions_serialize():
+    """Model-path predictions must hold plain floats so they JSON-serialize"""
+    print("Testing model prediction serialization...")
+    
+    prioritizer = MLTaskPrioritizer()
+    for i in range(40):
+        prioritizer.add_historical_data(make_task(i))
+    
+    if not prioritizer.train_models():
+        print("❌ Training failed")
+        return False
+    
+    predictions = prioritizer.predict_task_priorities([make_task(100 + i) for i in range(5)])
+    try:
+        json.dumps([asdict(prediction) for prediction in predictions])
+    except TypeError as e:
+        print(f"❌ Prediction is not JSON serializable: {e}")
+        return False
+    
+    print(f"✅ Serialized {len(predictions)} model predictions")
+    return True
+
+if __name__ == "__main__":
+    success = test_model_predictions_serialize()
+    sys.exit(0 if success else 1)